@@ -0,0 +1,148 @@
+# benchmarks/levels.py
+"""
+Synthetic stress levels.
+
+Writes .tmx files with the same "Bamboo", "Wood" and "Monkeys" object layers
+the real levels use, so they go through level_cache and Simulation exactly
+like hand-made ones.
+"""
+import os
+from xml.sax.saxutils import quoteattr
+
+from src import constants as c
+
+TILE_SIZE = 32
+# Every Tiled object is this size; the bodies themselves come from the 500x500
+# textures' hit boxes, which are much smaller, so the layout uses those
+OBJECT_SIZE = 500
+# Narrow blocks stacked much higher than this rock and topple before they settle
+TOWER_ROWS = 3
+# Keep clear of the launcher on the left and on the ground on the right
+STRUCTURE_LEFT = 400
+STRUCTURE_RIGHT = c.SCREEN_WIDTH / 2 + 1000
+GROUND_TOP = 20
+
+LAYER_ENTITIES = {"Bamboo": "BambooBlock", "Wood": "WoodBlock", "Monkeys": "EnemyMonkey"}
+_extents = {}
+
+
+def body_extent(layer):
+    """(left, right, bottom, top) of a layer's body around its center."""
+    if layer not in _extents:
+        from src import entities
+        sprite = getattr(entities, LAYER_ENTITIES[layer])()
+        sprite.position = (0, 0)
+        points = sprite.hit_box.get_adjusted_points()
+        _extents[layer] = (min(x for x, _ in points), max(x for x, _ in points),
+                           min(y for _, y in points), max(y for _, y in points))
+    return _extents[layer]
+
+
+def column_pitch(layers):
+    extents = [body_extent(layer) for layer in layers]
+    return max(right for _, right, _, _ in extents) - min(left for left, _, _, _ in extents)
+
+
+def max_columns(layers):
+    return max(1, int((STRUCTURE_RIGHT - STRUCTURE_LEFT) // column_pitch(layers)))
+
+
+def stack(cells, columns):
+    """
+    Body centers for a list of layer names, filled row by row from the ground
+    up in touching columns, each body just resting on the one below it.
+    Returns ({layer: [(x, y), ...]}, height of the tallest column).
+    """
+    layers = {"Bamboo": [], "Wood": [], "Monkeys": []}
+    pitch = column_pitch(set(cells))
+    # Everything in a column shares one center line, so nothing overhangs what holds it
+    center = -min(body_extent(layer)[0] for layer in set(cells))
+    tops = [GROUND_TOP] * columns
+    for i, layer in enumerate(cells):
+        column = i % columns
+        _, _, bottom, top = body_extent(layer)
+        x = STRUCTURE_LEFT + column * pitch + center
+        y = tops[column] - bottom
+        tops[column] = y + top
+        layers[layer].append((x, y))
+    return layers, max(tops)
+
+
+def blocks(n, columns):
+    """n blocks in a brick pattern of bamboo and wood."""
+    return stack(["Bamboo" if sum(divmod(i, columns)) % 2 == 0 else "Wood" for i in range(n)], columns)
+
+
+def tower(n):
+    """n blocks at most TOWER_ROWS high (and at least two columns wide, so it stands) with a monkey on top."""
+    columns = min(max_columns(["Bamboo", "Wood"]), max(2, -(-n // TOWER_ROWS)))
+    layers, top = blocks(n, columns)
+    # Centered over the middle of the top row
+    x = STRUCTURE_LEFT + columns * column_pitch(["Bamboo", "Wood"]) / 2
+    layers["Monkeys"].append((x, top - body_extent("Monkeys")[2]))
+    return layers
+
+
+def wall(n):
+    """n blocks as wide as the ground allows."""
+    return blocks(n, max_columns(["Bamboo", "Wood"]))[0]
+
+
+def enemies(n):
+    """n monkeys stacked on the ground."""
+    return stack(["Monkeys"] * n, max_columns(["Monkeys"]))[0]
+
+
+SCENARIOS = {
+    "tower": tower,
+    "wall": wall,
+    "enemies": enemies,
+}
+
+
+def object_corner(layer, x, y):
+    """
+    Bottom-left corner of the Tiled object that puts a body's center at (x, y).
+
+    Blocks are centered on their object; a monkey is placed a further half
+    object up and to the right of it (see EnemyMonkey).
+    """
+    offset = OBJECT_SIZE if layer == "Monkeys" else OBJECT_SIZE / 2
+    return x - offset, y - offset
+
+
+def write_tmx(path, layers):
+    """Write object layers (body centers in world space) as a Tiled map."""
+    corners = {layer: [object_corner(layer, x, y) for x, y in positions] for layer, positions in layers.items()}
+    top = max((y for positions in corners.values() for _, y in positions), default=0)
+    height_tiles = int((top + OBJECT_SIZE) // TILE_SIZE) + 1
+    width_tiles = int(STRUCTURE_RIGHT // TILE_SIZE) + 1
+    map_height = height_tiles * TILE_SIZE
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<map version="1.10" orientation="orthogonal" renderorder="right-down" '
+        f'width="{width_tiles}" height="{height_tiles}" tilewidth="{TILE_SIZE}" '
+        f'tileheight="{TILE_SIZE}" infinite="0">',
+    ]
+    object_id = 1
+    for layer_id, (name, positions) in enumerate(corners.items(), start=1):
+        lines.append(f' <objectgroup id="{layer_id}" name={quoteattr(name)}>')
+        for x, y in positions:
+            # Tiled's y axis points down from the top-left corner
+            tiled_y = map_height - y - OBJECT_SIZE
+            lines.append(f'  <object id="{object_id}" x="{x:g}" y="{tiled_y:g}" '
+                         f'width="{OBJECT_SIZE}" height="{OBJECT_SIZE}"/>')
+            object_id += 1
+        lines.append(' </objectgroup>')
+    lines.append('</map>')
+
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def generate(scenario, n, out_dir):
+    """Write the level for one scenario and size; returns its path."""
+    os.makedirs(out_dir, exist_ok=True)
+    return write_tmx(os.path.join(out_dir, f"{scenario}_{n}.tmx"), SCENARIOS[scenario](n))
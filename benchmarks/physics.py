@@ -0,0 +1,237 @@
+# benchmarks/physics.py
+"""
+Headless physics benchmarks on synthetic stress levels.
+
+For each scenario (tower, wall, enemies) and size N this measures:
+  - load time: compiling the .tmx and building the Simulation
+  - settle time: simulated and wall-clock time until every body sleeps
+    (nothing may break while the structure settles, or the run is invalid)
+  - step cost: physics_engine.step, damage, cull_bodies and check_collisions while
+    a volley of bananas hits the structure
+
+Usage:
+
+    python -m benchmarks.physics [--scenarios tower wall] [--sizes 8 16 32]
+                                 [--save-baseline] [--fail-on-regression]
+
+Results go to benchmarks/results/latest.json and are compared with
+benchmarks/baseline.json when it exists. --save-baseline stores this run as
+the new baseline; baselines are machine-specific, so only compare runs made
+on the same machine.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks import levels
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "latest.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_VERSION = 2  # 2: synthetic levels rest on the ground instead of dropping onto it
+
+DEFAULT_SIZES = [4, 8, 16, 32]
+SETTLE_LIMIT = 20.0  # Simulated seconds before giving up on a structure settling
+VOLLEY = [(800, 300), (900, 500), (700, 200)]  # Banana impulses fired at the structure
+VOLLEY_SECONDS = 3.0
+REGRESSION_THRESHOLD = 0.10
+# Metrics where a higher number is worse; everything else is informational
+TIMED_METRICS = ("compile_ms", "load_ms", "settle_wall_ms", "step_ms", "damage_ms", "cull_ms",
+                 "check_collisions_ms")
+
+SECTIONS = {
+    "physics_engine.step": "step_ms",
+    "damage": "damage_ms",
+    "cull_bodies": "cull_ms",
+    "check_collisions": "check_collisions_ms",
+}
+
+
+def section_totals(profiler, since):
+    """Total seconds and call counts per profiler section for events after index `since`."""
+    totals = {}
+    for name, start, end, _ in profiler.events[since:]:
+        total, count = totals.get(name, (0.0, 0))
+        totals[name] = (total + end - start, count + 1)
+    return totals
+
+
+def bench_level(path):
+    """Run every measurement on one level file; returns a dict of metrics."""
+    from src import level_cache
+    from src.profiler import profiler
+    from src.simulation import Simulation
+
+    result = {}
+
+    start = time.perf_counter()
+    level = level_cache.compile_level(path)
+    result["compile_ms"] = (time.perf_counter() - start) * 1000
+    result["bodies"] = len(level)
+
+    start = time.perf_counter()
+    sim = Simulation(path, verbose=False)
+    result["load_ms"] = (time.perf_counter() - start) * 1000
+
+    # Settle: step until everything is asleep
+    bodies = sim.body_counts()[0]
+    start = time.perf_counter()
+    settle_steps = int(SETTLE_LIMIT / sim.dt)
+    for _ in range(settle_steps):
+        sim.step()
+        active, _ = sim.body_counts()
+        if active == 0:
+            break
+    result["settle_wall_ms"] = (time.perf_counter() - start) * 1000
+    result["settle_sim_s"] = sim.elapsed
+    result["settled"] = sim.body_counts()[0] == 0
+    # A structure that collapsed or broke on its own would leave the volley nothing to time
+    result["settle_lost"] = bodies - sum(sim.body_counts())
+    result["valid"] = result["settled"] and result["settle_lost"] == 0
+
+    # Impact: time each part of the step while bananas knock things over
+    profiler.enable()
+    first_event = len(profiler.events)
+    steps = 0
+    for impulse in VOLLEY:
+        sim.launch(impulse)
+        for _ in range(int(VOLLEY_SECONDS / len(VOLLEY) / sim.dt)):
+            sim.step()
+            steps += 1
+    totals = section_totals(profiler, first_event)
+    profiler.enabled = False
+    for section, metric in SECTIONS.items():
+        total, _ = totals.get(section, (0.0, 0))
+        result[metric] = total / steps * 1000
+    result["steps_per_second"] = steps / max(1e-9, sum(t for t, _ in totals.values()))
+    result["removed"] = result["bodies"] - sum(
+        len(sprite_list) for sprite_list in (sim.bamboo_list, sim.wood_list, sim.enemy_list)
+    )
+    del profiler.events[first_event:]
+    return result
+
+
+def run(scenarios, sizes, repeat):
+    """Benchmark every scenario and size; timings are the median of `repeat` runs."""
+    work_dir = tempfile.mkdtemp(prefix="banana-bench-")
+    results = {}
+    try:
+        for scenario in scenarios:
+            for n in sizes:
+                path = levels.generate(scenario, n, work_dir)
+                runs = [bench_level(path) for _ in range(repeat)]
+                merged = dict(runs[0])
+                merged["valid"] = all(r["valid"] for r in runs)
+                for metric in TIMED_METRICS + ("steps_per_second",):
+                    merged[metric] = round(statistics.median(r[metric] for r in runs), 4)
+                key = f"{scenario}/{n}"
+                results[key] = merged
+                if not merged["valid"]:
+                    print(f"{key:<14} INVALID: {merged['settle_lost']} of {merged['bodies']} bodies lost "
+                          f"while settling{'' if merged['settled'] else ', never settled'}")
+                    continue
+                print(f"{key:<14} load {merged['load_ms']:8.1f} ms  "
+                      f"settle {merged['settle_sim_s']:5.2f} s sim / {merged['settle_wall_ms']:8.1f} ms  "
+                      f"step {merged['step_ms']:6.3f} ms  collisions {merged['check_collisions_ms']:6.3f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def environment():
+    import arcade
+    import pymunk
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "arcade": arcade.version.VERSION,
+        "pymunk": pymunk.version,
+    }
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare timed metrics against a baseline.
+
+    Returns a list of (key, metric, baseline value, current value, change)
+    for every metric that got slower by more than `threshold`.
+    """
+    regressions = []
+    for key, metrics in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric in TIMED_METRICS:
+            if metric not in old or old[metric] <= 0:
+                continue
+            change = metrics[metric] / old[metric] - 1
+            if change > threshold:
+                regressions.append((key, metric, old[metric], metrics[metric], change))
+    return regressions
+
+
+def write_json(path, data):
+    from src import level_cache
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    level_cache.atomic_write(path, lambda f: json.dump(data, f, indent=1), 'w')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless physics benchmarks on synthetic levels.")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(levels.SCENARIOS), default=list(levels.SCENARIOS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per level; the median is kept")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero if anything got slower")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Slowdown (as a fraction) counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.scenarios, args.sizes, args.repeat)
+    report = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "results": results,
+    }
+    write_json(RESULTS_PATH, report)
+    print(f"Wrote {RESULTS_PATH}")
+    invalid = [key for key, metrics in results.items() if not metrics["valid"]]
+    if invalid:
+        print(f"Invalid runs (structure did not survive settling): {', '.join(invalid)}")
+        return 1
+
+    if args.save_baseline:
+        write_json(args.baseline, report)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to store one")
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    if baseline.get("version") != RESULTS_VERSION:
+        print("Baseline is from an older version of these benchmarks; run with --save-baseline to replace it")
+        return 0
+    if baseline.get("environment", {}).get("machine") != report["environment"]["machine"]:
+        print("Warning: baseline was recorded on a different machine type")
+
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    for key, metric, old, new, change in regressions:
+        print(f"SLOWER  {key:<14} {metric:<20} {old:10.3f} -> {new:10.3f}  (+{change:.0%})")
+    if not regressions:
+        print(f"No regressions over {args.threshold:.0%} against the baseline")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
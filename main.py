@@ -1,13 +1,46 @@
 # main.py
+import time
+START = time.perf_counter()  # Before any other import, for --startup-profile
+
+import argparse
+import atexit
+import os
+
+from src.startup import startup
+startup.begin(START)
+
 import arcade
+startup.mark("import arcade")
 from src import constants as c
+from src.assets import assets
+from src.profiler import profiler
+from src.projectiles import projectiles
 from src.views.menu_view import MenuView
+startup.mark("import menu")  # The level select and game modules load on first use
 
 def main():
     """ Main function """
+    parser = argparse.ArgumentParser(description=c.SCREEN_TITLE)
+    parser.add_argument("--profile", action="store_true",
+                        help="Time hot paths (F3 toggles the overlay) and write a Chrome trace on exit")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print how long each stage of startup took, up to the first menu frame")
+    args = parser.parse_args()
+    startup.enabled = args.startup_profile
+
+    if args.profile or os.environ.get("BANANA_PROFILE"):
+        profiler.enable()
+        atexit.register(profiler.write_trace)
+
+    projectiles.load()  # Fail fast on a broken projectiles.json
+    startup.mark("load projectiles")
     window = arcade.Window(c.SCREEN_WIDTH, c.SCREEN_HEIGHT, c.SCREEN_TITLE)
+    startup.mark("open window")
+    # Textures for the first level load while the player looks at the menu
+    startup.after_first_frame(assets.preload_async)
     menu_view = MenuView()
     window.show_view(menu_view)
+    startup.mark("show menu")
     arcade.run()
 
 if __name__ == "__main__":
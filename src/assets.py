@@ -0,0 +1,172 @@
+# src/assets.py
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import arcade
+from src import constants as c
+
+# Everything the game needs on its first level, loaded once at startup
+PRELOAD_MANIFEST = [
+    ("texture", "assets/images/throwing_chimp.png"),
+    ("texture", "assets/images/banana_sprite.png"),
+    ("texture", "assets/images/bamboo_wall_1.png"),
+    ("texture", "assets/images/wood_wall_1.png"),
+    ("texture", "assets/sprites/big_head_ape.png"),
+] + [("sound", effect["file"]) for effect in c.SFX_EFFECTS.values()]
+# The menu music is opened by play_music_async() instead
+
+MUSIC_POLL_INTERVAL = 0.1  # Seconds between checks on music loading in the background
+
+# Decoded PCM size estimate for static sounds (44.1 kHz, 16-bit stereo)
+PCM_BYTES_PER_SECOND = 44100 * 2 * 2
+
+
+class AssetCache:
+    """
+    Process-wide cache of textures and sounds.
+
+    Each file is loaded once and the same object is handed to every caller.
+    Least recently used entries are dropped when the estimated memory use
+    goes over the budget.
+    """
+
+    def __init__(self, budget_bytes=c.ASSET_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # key -> (asset, size in bytes)
+        self.total_bytes = 0
+        self.load_times = OrderedDict()  # key -> seconds spent loading
+        self.music_path = None
+        self.music_volume = 0.5
+        self.music_player = None
+        self.music_loading = None  # Thread opening the next track, see play_music_async()
+        # Level loading decodes images on a worker thread
+        self.lock = threading.RLock()
+
+    # --- Lookups ---
+    def texture(self, path):
+        """Get the shared texture for an image file."""
+        return self._get(("texture", path), self._load_texture)
+
+    def sound(self, path, streaming=False):
+        """Get the shared sound for an audio file."""
+        kind = "music" if streaming else "sound"
+        return self._get((kind, path), self._load_sound)
+
+    def _get(self, key, loader):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry[0]
+
+            start = time.perf_counter()
+            asset, size = loader(*key)
+            self.load_times[key] = time.perf_counter() - start
+
+            self.entries[key] = (asset, size)
+            self.total_bytes += size
+            self._evict()
+            return asset
+
+    @staticmethod
+    def _load_texture(kind, path):
+        texture = arcade.load_texture(path)
+        return texture, texture.width * texture.height * 4
+
+    @staticmethod
+    def _load_sound(kind, path):
+        streaming = kind == "music"
+        sound = arcade.load_sound(path, streaming=streaming)
+        if streaming:
+            size = os.path.getsize(path)
+        else:
+            size = int(sound.get_length() * PCM_BYTES_PER_SECOND)
+        return sound, size
+
+    def _evict(self):
+        """Drop least recently used assets until back under budget (never the newest)."""
+        while self.total_bytes > self.budget_bytes and len(self.entries) > 1:
+            key, (_, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+
+    # --- Startup ---
+    def preload_async(self, manifest=PRELOAD_MANIFEST):
+        """Run preload() on a background thread."""
+        thread = threading.Thread(target=self.preload, args=(manifest,), daemon=True)
+        thread.start()
+        return thread
+
+    def preload(self, manifest=PRELOAD_MANIFEST):
+        """Load every asset in the manifest and print how long each one took."""
+        start = time.perf_counter()
+        for kind, path in manifest:
+            if kind == "texture":
+                self.texture(path)
+            else:
+                self.sound(path, streaming=(kind == "music"))
+        total = time.perf_counter() - start
+
+        print(f"Preloaded {len(manifest)} assets in {total * 1000:.1f} ms "
+              f"({self.total_bytes / (1024 * 1024):.1f} MiB cached)")
+        for kind, path in manifest:
+            seconds = self.load_times.get((kind, path))
+            if seconds is not None:
+                print(f"  {seconds * 1000:7.1f} ms  {kind:<7} {path}")
+
+    # --- Music ---
+    def play_music(self, path, volume=0.5):
+        """Start looping background music, unless that track is already playing."""
+        if self.music_player is not None and self.music_path == path:
+            return
+        self.stop_music()
+
+        # A streaming source can only be played once, so take it out of the cache
+        key = ("music", path)
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.total_bytes -= entry[1]
+        if entry is not None:
+            music = entry[0]
+        else:
+            music, _ = self._load_sound(*key)
+
+        self.music_path = path
+        self.music_player = arcade.play_sound(music, volume=volume, loop=True)
+
+    def play_music_async(self, path, volume=0.5):
+        """
+        Like play_music(), but the track is opened on a background thread.
+
+        The main thread checks on it a few times a second (the player has
+        to be made there) and starts it once it has loaded.
+        """
+        if self.music_path == path and (self.music_player is not None or self.music_loading is not None):
+            return
+        self.stop_music()
+        self.music_path = path
+        self.music_volume = volume
+        self.music_loading = threading.Thread(target=self.sound, args=(path, True), daemon=True)
+        self.music_loading.start()
+        arcade.schedule(self.poll_music, MUSIC_POLL_INTERVAL)
+
+    def poll_music(self, delta_time=0.0):
+        """Start music loaded by play_music_async() once it is ready."""
+        if self.music_loading is not None and not self.music_loading.is_alive():
+            arcade.unschedule(self.poll_music)
+            self.music_loading = None
+            self.play_music(self.music_path, self.music_volume)
+
+    def stop_music(self):
+        if self.music_loading is not None:
+            arcade.unschedule(self.poll_music)
+            self.music_loading = None
+        if self.music_player is not None:
+            arcade.stop_sound(self.music_player)
+        self.music_player = None
+
+
+# Global asset cache instance
+assets = AssetCache()
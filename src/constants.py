@@ -7,19 +7,59 @@ SCREEN_HEIGHT = 720
 SCREEN_TITLE = "Banana Barrage"
 
 # --- Physics (Tune these for fun) ---
+RULES_VERSION = 3  # Bump when a code change alters shot outcomes (invalidates solver results)
 GRAVITY = (0, -1000)
 DEFAULT_DAMPING = 1.0
+PHYSICS_DT = 1 / 60  # Fixed physics timestep (seconds)
+MAX_FRAME_TIME = 0.25  # Longest frame the simulation will catch up on
+SLEEP_TIME_THRESHOLD = 0.5  # Seconds a stack must stay idle before pymunk sleeps it
+IDLE_SPEED_THRESHOLD = 5  # Speed (px/s) below which a body counts as idle
+
+# --- World Bounds (bodies leaving these are removed) ---
+WORLD_LEFT = -500
+WORLD_RIGHT = 2500
+WORLD_BOTTOM = -500
+CULL_INTERVAL_STEPS = 10  # How often settled/out-of-bounds bodies are checked
+SPATIAL_CELL_SIZE = 512  # Grid cell size of the spatial index, in pixels
+
+# --- Physics Scheduler (quality drops when physics can't keep up) ---
+MAX_SUBSTEPS = 4  # Physics steps per frame at most; any backlog beyond is dropped
+PHYSICS_FRAME_BUDGET = 0.008  # Seconds of physics per frame before quality is lowered
+QUALITY_RECOVER_RATIO = 0.4  # Raise quality again below this share of the budget
+QUALITY_WINDOW = 30  # Frames averaged when judging the load
+QUALITY_COOLDOWN = 2.0  # Seconds between quality changes
+# Tier 0 is full quality; cull/damage intervals are in physics steps
+QUALITY_TIERS = [
+    {"name": "high", "iterations": 10, "damage_interval": 1, "cull_interval": CULL_INTERVAL_STEPS},
+    {"name": "medium", "iterations": 6, "damage_interval": 2, "cull_interval": CULL_INTERVAL_STEPS * 2},
+    {"name": "low", "iterations": 3, "damage_interval": 4, "cull_interval": CULL_INTERVAL_STEPS * 3},
+]
+
+# --- Banana (defaults; each banana type in assets/projectiles.json sets its own) ---
 BANANA_DAMPING = 0.6
 BANANA_MASS = 0.5
 BANANA_FRICTION = 0.6
+MAX_LIVE_BANANAS = 8  # Oldest banana is retired when another is launched
+BANANA_REST_SPEED = 10  # Below this speed (px/s) a banana is considered at rest
+BANANA_REST_TIME = 1.0  # Seconds at rest before a banana is retired
+
+# --- Debris (pieces of broken blocks, pooled) ---
+DEBRIS_PIECES = 4  # Pieces per broken block
+DEBRIS_SCALE = 0.15
+DEBRIS_MASS = 0.05
+DEBRIS_SPEED = 250  # Top launch speed (px/s) of a piece
+DEBRIS_LIFETIME = 1.5  # Seconds before a piece is returned to its pool
+MAX_LIVE_DEBRIS = 48  # Oldest piece is retired beyond this
+DEBRIS_PREFILL = 16  # Pieces per material allocated while the level loads
 
 # --- Bamboo Block Properties ---
 BAMBOO_MASS = 0.3  # Lighter, breaks easily
 BAMBOO_FRICTION = 0.5
 BAMBOO_SCALE = 1.0
+BAMBOO_BREAK_SLOWDOWN = 0.5  # Share of its speed a banana keeps when it breaks through bamboo
 
 # --- Wood Block Properties ---
-WOOD_MASS = 1.0  # Heavier, doesn't break
+WOOD_MASS = 1.0  # Heavier, takes a lot to break
 WOOD_FRICTION = 0.7
 WOOD_SCALE = 1.0
 
@@ -37,13 +77,90 @@ WALL_SCALE = WOOD_SCALE
 PLAYER_START_POS = (150, 200)
 BANANA_START_POS = (PLAYER_START_POS[0] + 20, PLAYER_START_POS[1])
 THROW_FORCE_MULTIPLIER = 4.0
+# Strongest throw: a drag across the whole window
+MAX_THROW_IMPULSE = (SCREEN_WIDTH ** 2 + SCREEN_HEIGHT ** 2) ** 0.5 * THROW_FORCE_MULTIPLIER
+LAUNCH_COOLDOWN_STEPS = round(0.25 / PHYSICS_DT)  # Shortest time between throws, in physics steps
+
+# --- Trajectory Preview ---
+TRAJECTORY_DOTS = 30
+TRAJECTORY_DOT_INTERVAL = 0.05  # Seconds of flight between dots
+TRAJECTORY_REBUILD_THRESHOLD = 3  # Pixels the drag must move before recomputing
 
 # --- Sprite Scaling ---
 PLAYER_SCALE = 1.0
 BANANA_SCALE = 1.0
 
+# --- Assets ---
+ASSET_CACHE_BUDGET = 256 * 1024 * 1024  # Bytes of textures/sounds kept loaded
+
+# --- Sound Effects (event name -> effect; strength is impact speed, or impulse for launches) ---
+SFX_VOICES = 8  # Players shared by every effect
+SFX_VOLUME = 0.8
+SFX_MIN_VOLUME = 0.2  # Volume share of the weakest audible hit
+SFX_EFFECTS = {
+    "launch": {"file": "assets/sfx/wooshv1.wav", "priority": 2, "min_interval": 0.05, "full_volume": 1200},
+    "bamboo": {"file": "assets/sfx/falling-bamboo.mp3", "priority": 1, "min_interval": 0.1, "full_volume": 400},
+    "wood": {"file": "assets/sfx/wood-falling.mp3", "priority": 1, "min_interval": 0.1, "full_volume": 400},
+    "enemy": {"file": "assets/sfx/monkey.mp3", "priority": 3, "min_interval": 0.15, "full_volume": 300},
+}
+
+# --- Loading ---
+LOADING_FRAME_BUDGET = 0.004  # Seconds per frame spent uploading a level to the GPU
+
+# --- Profiling (opt-in with --profile) ---
+PROFILER_WINDOW = 300  # Recent samples per section used for percentiles
+PROFILER_MAX_TRACE_EVENTS = 500_000
+PROFILER_OVERLAY_REFRESH = 0.5  # Seconds between overlay text updates
+PROFILER_TRACE_FILE = "profile_trace.json"
+
+# --- Level Select ---
+LEVEL_BUTTONS_PER_ROW = 4
+LEVELS_PER_PAGE = 12
+THUMBNAIL_WIDTH = 96
+THUMBNAIL_HEIGHT = 54
+THUMBNAIL_ATLAS_COLUMNS = 16
+
+# --- Save Data ---
+DATA_DIR_NAME = "Banana Barrage"
+PROGRESS_SAVE_DELAY = 1.0  # Seconds to wait (and batch changes) before writing progress
+
+# --- Scoring ---
+SCORE_PER_ENEMY = 1000
+SCORE_PER_SPARE_BANANA = 500
+SCORE_BANANA_BUDGET = 5  # Bananas under this count earn a bonus
+
 # --- Colors ---
 BACKGROUND_COLOR = arcade.color.ALMOND
 
 # --- Collision Detection ---
-COLLISION_SPEED_THRESHOLD = 100  # Minimum speed to trigger effects
\ No newline at end of file
+COLLISION_SPEED_THRESHOLD = 100  # Minimum speed to trigger effects
+# Contact impulse of a banana at threshold speed hitting a bamboo block. Damage
+# compares it per fixed PHYSICS_DT step (see damage.py), never per rendered frame
+COLLISION_IMPULSE_THRESHOLD = (
+    COLLISION_SPEED_THRESHOLD * BANANA_MASS * BAMBOO_MASS / (BANANA_MASS + BAMBOO_MASS)
+)
+
+# --- Damage (impulse taken before breaking / dying, per material) ---
+# Each physics step a body takes the impulse that changed its velocity, less
+# what holding up its own weight costs; hits under "threshold" are shrugged off
+# and the part of a hit over it comes off health. So one hit breaks a body once
+# it reaches health + threshold:
+#   bamboo: exactly COLLISION_IMPULSE_THRESHOLD, the old bamboo break impulse
+#   wood:   8x that (wood couldn't break at all before)
+#   enemy:  6x that, for falls and crushing (a banana touching one still kills it)
+# Smaller hits over the threshold add up.
+MATERIALS = {
+    "bamboo": {"health": COLLISION_IMPULSE_THRESHOLD * 0.5, "threshold": COLLISION_IMPULSE_THRESHOLD * 0.5},
+    "wood": {"health": COLLISION_IMPULSE_THRESHOLD * 6, "threshold": COLLISION_IMPULSE_THRESHOLD * 2},
+    "enemy": {"health": COLLISION_IMPULSE_THRESHOLD * 3, "threshold": COLLISION_IMPULSE_THRESHOLD * 3},
+}
+# Longest a (re)started level settles without damage; every block and monkey
+# falling asleep ends it sooner. Throwing a banana doesn't end it
+DAMAGE_GRACE_TIME = 1.0
+
+# --- Collision Types (pymunk) ---
+BANANA_COLLISION_TYPE = "banana"
+BAMBOO_COLLISION_TYPE = "bamboo"
+WOOD_COLLISION_TYPE = "wood"
+ENEMY_COLLISION_TYPE = "enemy"
+DEBRIS_COLLISION_TYPE = "debris"
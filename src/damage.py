@@ -0,0 +1,144 @@
+# src/damage.py
+"""
+Block and monkey damage.
+
+Every damageable body has health from its material in c.MATERIALS. Instead
+of a Python callback per colliding pair, damage is gathered in one pass per
+physics step: the impulse a body took is mass * |dv - g*dt|, the velocity
+change gravity doesn't explain. Monkeys can also be crushed: contact
+impulses that cancel each other out (pressed from above and held from
+below) squeeze the body, and a sudden rise in that squeeze, like something
+heavy landing on one, hurts it even when it can't move. A load that is
+already resting on it does not, so a settled stack of monkeys stays put.
+Per-body state lives in flat arrays allocated once per level.
+
+Weight and contact loads are measured per fixed PHYSICS_DT step, so the
+thresholds in c.MATERIALS hold at any frame rate, but they would need
+retuning if PHYSICS_DT itself changed.
+"""
+import math
+from array import array
+
+from src import constants as c
+
+
+class DamageModel:
+    """Health of every block and monkey in a level."""
+
+    def __init__(self, gravity=c.GRAVITY, dt=c.PHYSICS_DT):
+        self.gravity_dt = (gravity[0] * dt, gravity[1] * dt)
+        self.weight_dt = math.hypot(*gravity) * dt
+        self.sprites = []
+        self.bodies = []
+        self.slots = {}  # sprite -> index into the arrays
+        self.mass = array('d')
+        self.health = array('d')
+        self.max_health = array('d')
+        self.weight = array('d')  # Impulse per step spent holding up the body's own weight
+        self.threshold = array('d')  # Impulse per check that does no damage
+        self.prev_vx = array('d')
+        self.prev_vy = array('d')
+        self.prev_squeeze = array('d')  # Crushable bodies: squeeze at the last update
+        self.alive = array('B')
+        self.crushable = array('B')
+        self.load = 0.0
+        self.load_x = 0.0
+        self.load_y = 0.0
+        self.awake = 0  # Bodies that were awake at the last update
+
+    def build(self, physics_engine, sprites):
+        """Allocate a slot for every sprite; they must already be in the physics engine."""
+        count = len(sprites)
+        self.sprites = list(sprites)
+        self.bodies = [physics_engine.get_physics_object(sprite).body for sprite in self.sprites]
+        self.slots = {sprite: i for i, sprite in enumerate(self.sprites)}
+        self.mass = array('d', (body.mass for body in self.bodies))
+        self.max_health = array('d', (c.MATERIALS[sprite.material]["health"] for sprite in self.sprites))
+        self.weight = array('d', (body.mass * self.weight_dt for body in self.bodies))
+        self.threshold = array('d', (c.MATERIALS[sprite.material]["threshold"] for sprite in self.sprites))
+        self.crushable = array('B', (sprite.material == "enemy" for sprite in self.sprites))
+        self.health = array('d', self.max_health)
+        self.prev_vx = array('d', bytes(8 * count))
+        self.prev_vy = array('d', bytes(8 * count))
+        self.prev_squeeze = array('d', bytes(8 * count))
+        self.alive = array('B', b"\x01" * count)
+
+    def forget(self, sprite):
+        """Stop tracking a sprite that has left the world."""
+        slot = self.slots.get(sprite)
+        if slot is not None:
+            self.alive[slot] = 0
+
+    def update(self, apply_damage=True, steps=1):
+        """
+        Take the impulses since the last update off each awake body's health.
+
+        `steps` is how many physics steps that covers (the damage pass can
+        run less often than every step). Returns the sprites whose health ran
+        out. With apply_damage=False only the velocities and loads are
+        tracked (while the level settles).
+        """
+        gx = self.gravity_dt[0] * steps
+        gy = self.gravity_dt[1] * steps
+        bodies = self.bodies
+        mass = self.mass
+        health = self.health
+        weight = self.weight
+        threshold = self.threshold
+        prev_vx = self.prev_vx
+        prev_vy = self.prev_vy
+        prev_squeeze = self.prev_squeeze
+        alive = self.alive
+        crushable = self.crushable
+        broken = []
+        awake = 0
+
+        for i, body in enumerate(bodies):
+            if not alive[i]:
+                continue
+            if body.is_sleeping:
+                prev_vx[i] = 0.0
+                prev_vy[i] = 0.0
+                continue
+            awake += 1
+            vx, vy = body.velocity
+            dvx = vx - prev_vx[i] - gx
+            dvy = vy - prev_vy[i] - gy
+            prev_vx[i] = vx
+            prev_vy[i] = vy
+            crush = 0.0
+            if crushable[i]:
+                self.load = self.load_x = self.load_y = 0.0
+                body.each_arbiter(self._add_load)
+                # What the contacts don't add up to (its own weight) is squeezing it
+                squeeze = (self.load - math.hypot(self.load_x, self.load_y)) / 2
+                crush = squeeze - prev_squeeze[i]
+                prev_squeeze[i] = squeeze
+            if not apply_damage:
+                continue
+
+            # Impulse beyond what holding up its weight took over those steps
+            impulse = mass[i] * math.sqrt(dvx * dvx + dvy * dvy) - weight[i] * steps
+            if crush > impulse:
+                impulse = crush
+            damage = impulse - threshold[i]
+            if damage > 0:
+                health[i] -= damage
+                if health[i] <= 0:
+                    alive[i] = 0
+                    broken.append(self.sprites[i])
+        self.awake = awake
+        return broken
+
+    def _add_load(self, arbiter):
+        impulse = arbiter.total_impulse
+        self.load += impulse.length
+        self.load_x += impulse.x
+        self.load_y += impulse.y
+
+    def health_fraction(self, sprite):
+        """Remaining health from 0 to 1, or None if the sprite isn't tracked."""
+        slot = self.slots.get(sprite)
+        if slot is None:
+            return None
+        return max(0.0, self.health[slot] / self.max_health[slot])
@@ -2,36 +2,53 @@
 # src/entities.py
 import arcade
 from src import constants as c
+from src.assets import assets
 
 IMG_PATH = "assets/images/"
 
 class PlayerMonkey(arcade.Sprite):
     """ The monkey that throws. This one DOES NOT have physics. """
     def __init__(self):
-        super().__init__(f"{IMG_PATH}throwing_chimp.png", c.PLAYER_SCALE)
+        super().__init__(assets.texture(f"{IMG_PATH}throwing_chimp.png"), c.PLAYER_SCALE)
         self.position = c.PLAYER_START_POS
 
 class Banana(arcade.Sprite):
     """ The banana projectile. This one HAS physics. """
-    def __init__(self):
-        super().__init__(f"{IMG_PATH}banana_sprite.png", c.BANANA_SCALE)
-        self.damping = c.BANANA_DAMPING
-        self.mass = c.BANANA_MASS
+    def __init__(self, kind=None):
+        if kind is None:
+            super().__init__(assets.texture(f"{IMG_PATH}banana_sprite.png"), c.BANANA_SCALE)
+            self.damping = c.BANANA_DAMPING
+            self.mass = c.BANANA_MASS
+            self.friction = c.BANANA_FRICTION
+        else:
+            super().__init__(assets.texture(kind.texture), kind.scale)
+            if kind.color:
+                self.color = kind.color
+            self.damping = kind.damping
+            self.mass = kind.mass
+            self.friction = kind.friction
+        self.kind = kind
+        self.armed = kind is not None and kind.effect is not None  # Effect still to fire
+        self.rest_time = 0.0
 
 
 class EnemyMonkey(arcade.Sprite):
+    """ A monkey to knock out. Dies from a banana hit, a hard fall or being crushed. """
+    material = "enemy"
+
     def __init__(self, x=0, y=0, width=32, height=32):
-        super().__init__()
-        self.texture = arcade.load_texture("assets/sprites/big_head_ape.png")
+        super().__init__(assets.texture("assets/sprites/big_head_ape.png"))
         self.center_x = x + width / 2
         self.center_y = y + height / 2
 
 
 
 class BambooBlock(arcade.Sprite):
-    """ Bamboo block that breaks when hit and slows down the banana. """
+    """ Bamboo block that breaks after a hit or two. """
+    material = "bamboo"
+
     def __init__(self, position=None):
-        super().__init__(f"{IMG_PATH}bamboo_wall_1.png", c.BAMBOO_SCALE)
+        super().__init__(assets.texture(f"{IMG_PATH}bamboo_wall_1.png"), c.BAMBOO_SCALE)
         if position:
             self.position = position
         self.mass = c.BAMBOO_MASS
@@ -39,15 +56,31 @@ class BambooBlock(arcade.Sprite):
 
 
 class WoodBlock(arcade.Sprite):
-    """ Wood block that doesn't break but falls when hit. """
+    """ Wood block that takes a lot of damage before breaking. """
+    material = "wood"
+
     def __init__(self, position=None):
-        super().__init__(f"{IMG_PATH}wood_wall_1.png", c.WOOD_SCALE)
+        super().__init__(assets.texture(f"{IMG_PATH}wood_wall_1.png"), c.WOOD_SCALE)
         if position:
             self.position = position
         self.mass = c.WOOD_MASS
         self.friction = c.WOOD_FRICTION
 
 
+DEBRIS_TEXTURES = {
+    "bamboo": f"{IMG_PATH}bamboo_wall_1.png",
+    "wood": f"{IMG_PATH}wood_wall_1.png",
+}
+
+
+class Debris(arcade.Sprite):
+    """ A small piece thrown off a broken block. It collides with nothing and is retired after a while. """
+    def __init__(self, material):
+        super().__init__(assets.texture(DEBRIS_TEXTURES[material]), c.DEBRIS_SCALE)
+        self.material = material
+        self.age = 0.0
+
+
 # Legacy support
 class WallBlock(WoodBlock):
     """ Alias for WoodBlock for backwards compatibility. """
@@ -0,0 +1,397 @@
+# src/leaderboard.py
+"""
+Score-attack leaderboard server.
+
+Clients submit replays (see replay.py); a score only goes on the board once
+the server has re-simulated the replay headlessly and got the same outcome.
+Replays are checked against the server's own copy of each level, looked up
+by the level hash the replay was recorded on.
+
+The front end is asyncio over TCP, one JSON object per line each way:
+
+    {"op": "submit", "player": "ann", "replay": "<base64 .rpl bytes>"}
+        -> {"ok": true, "id": 7, "status": "queued"}
+    {"op": "status", "id": 7}
+        -> {"ok": true, "id": 7, "status": "verified", "score": 3500, ...}
+    {"op": "leaderboard", "level": "<level hash>", "limit": 10}
+        -> {"ok": true, "scores": [{"player": "ann", "score": 3500}, ...]}
+
+Accepted submissions wait in a bounded queue; when it is full the submit is
+refused with "busy" and the client retries later, so a burst of players can't
+pile up unbounded work. Replays whose throws no player could have made (too
+strong, too close together, too many, or with unknown bananas) are refused
+before they are queued, and one thrown before the level settled fails
+verification. Worker processes re-simulate the replays and results
+go into SQLite (":memory:" keeps everything in-process, for local testing);
+the database is only touched from one background thread, never the event loop.
+Usage:
+
+    python -m src.leaderboard serve [--port 8765] [--db scores.db] [--workers N]
+    python -m src.leaderboard submit FILE --player NAME
+    python -m src.leaderboard top LEVEL_HASH
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import sqlite3
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.replay import ImpossibleLaunch, Replay, launch_errors, play
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+QUEUE_SIZE = 64  # Replays waiting for a worker before submits are refused
+MAX_LINE = 1024 * 1024  # Longest request line, in bytes
+MAX_REPLAY_FRAMES = 60 * 60 * 10  # Ten minutes of play at 60 steps a second
+MAX_REPLAY_LAUNCHES = 100
+MAX_PLAYER_NAME = 32
+DEFAULT_LEVEL_HASH = "00" * 20  # Replays of the built-in default level
+STATUS_POLL_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    level_hash TEXT NOT NULL,
+    claimed_score INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    score INTEGER,
+    frames INTEGER,
+    error TEXT,
+    submitted REAL NOT NULL,
+    verified REAL
+);
+CREATE INDEX IF NOT EXISTS submissions_by_level ON submissions (level_hash, status, score);
+"""
+
+
+def verify_submission(level_path, data):
+    """
+    Re-simulate a submitted replay on the server's copy of its level.
+
+    Runs in a worker process. Returns a dict with 'ok' and either the
+    verified score and frame count or an 'error'.
+    """
+    try:
+        replay = Replay.from_bytes(data)
+        replay.level_path = level_path
+        sim = play(replay)
+    except ImpossibleLaunch as e:
+        return {'ok': False, 'error': f"impossible replay: {e}"}
+    except Exception as e:
+        return {'ok': False, 'error': f"could not replay: {e}"}
+    if not sim.is_cleared:
+        return {'ok': False, 'error': "level not cleared"}
+    if not replay.cleared or sim.score() != replay.score:
+        return {'ok': False, 'error': f"score {sim.score()} does not match the recorded {replay.score}"}
+    return {'ok': True, 'score': sim.score(), 'frames': sim.frame}
+
+
+class ResultsStore:
+    """
+    Submissions and their verification results, in SQLite.
+
+    Not thread safe: the server calls it from a single database thread.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        # Replays still queued when the server last stopped are gone with it
+        self.db.execute(
+            "UPDATE submissions SET status = 'rejected', error = 'server restarted' WHERE status = 'queued'"
+        )
+        self.db.commit()
+
+    def add(self, player, level_hash, claimed_score):
+        cursor = self.db.execute(
+            "INSERT INTO submissions (player, level_hash, claimed_score, status, submitted) "
+            "VALUES (?, ?, ?, 'queued', ?)",
+            (player, level_hash, claimed_score, time.time())
+        )
+        self.db.commit()
+        return cursor.lastrowid
+
+    def finish(self, submission_id, result):
+        self.db.execute(
+            "UPDATE submissions SET status = ?, score = ?, frames = ?, error = ?, verified = ? WHERE id = ?",
+            ("verified" if result['ok'] else "rejected", result.get('score'), result.get('frames'),
+             result.get('error'), time.time(), submission_id)
+        )
+        self.db.commit()
+
+    def get(self, submission_id):
+        row = self.db.execute(
+            "SELECT id, player, level_hash, status, score, frames, error FROM submissions WHERE id = ?",
+            (submission_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def leaderboard(self, level_hash, limit=10):
+        """Best verified score per player on a level, highest first."""
+        rows = self.db.execute(
+            "SELECT player, MAX(score) AS score FROM submissions "
+            "WHERE level_hash = ? AND status = 'verified' "
+            "GROUP BY player ORDER BY score DESC, MIN(verified) LIMIT ?",
+            (level_hash, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.db.close()
+
+
+def level_index(levels_dir):
+    """Map of level hash -> level file for every level the server knows ("" is the default level)."""
+    from src.level_registry import LevelRegistry
+    registry = LevelRegistry(levels_dir)
+    registry.refresh()
+    levels = {entry.hash: entry.path for entry in registry.levels}
+    levels[DEFAULT_LEVEL_HASH] = ""
+    return levels
+
+
+class LeaderboardServer:
+    """
+    Accepts replay submissions and verifies them on a pool of workers.
+
+    With workers=0 replays are verified on a single background thread of
+    this process instead of a process pool.
+    """
+
+    def __init__(self, levels, store=None, workers=None, queue_size=QUEUE_SIZE):
+        self.levels = levels
+        self.store = store or ResultsStore()
+        if workers == 0:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+            self.worker_count = 1
+        else:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+            self.worker_count = workers or os.cpu_count() or 1
+        self.db_executor = ThreadPoolExecutor(max_workers=1)  # Every store call runs here
+        self.queue = None
+        self.queue_size = queue_size
+        self.workers = []
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.workers = [asyncio.create_task(self.work()) for _ in range(self.worker_count)]
+        self.server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+        return self.server
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.db_executor.shutdown(wait=True)
+
+    async def db(self, method, *args):
+        """Run a ResultsStore call on the database thread, so SQLite never blocks the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self.db_executor, method, *args)
+
+    async def work(self):
+        """Take queued replays one at a time and record how verification went."""
+        loop = asyncio.get_running_loop()
+        while True:
+            submission_id, level_path, data = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.executor, verify_submission, level_path, data)
+            except Exception as e:  # The worker process died
+                result = {'ok': False, 'error': f"verification failed: {e}"}
+            await self.db(self.store.finish, submission_id, result)
+            self.queue.task_done()
+
+    async def handle(self, reader, writer):
+        """Serve one connection: a JSON response per request line."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Line longer than MAX_LINE
+                    writer.write(json.dumps({'ok': False, 'error': "request too large"}).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                writer.write(json.dumps(await self.dispatch(line)).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, line):
+        """The response to one request line; a request that fails in any way still gets one."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {'ok': False, 'error': "not JSON"}
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': "expected an object"}
+        try:
+            return await self.respond(request)
+        except Exception as e:
+            print(f"Warning: {request.get('op')!r} request failed: {e!r}")
+            return {'ok': False, 'error': "request failed"}
+
+    async def respond(self, request):
+        op = request.get("op")
+        if op == "submit":
+            return await self.submit(request)
+        if op == "status":
+            return await self.status(request)
+        if op == "leaderboard":
+            limit = request.get("limit", 10)
+            if not isinstance(limit, int) or not 0 < limit <= 100:
+                return {'ok': False, 'error': "limit must be 1-100"}
+            return {'ok': True, 'scores': await self.db(self.store.leaderboard, str(request.get("level")), limit)}
+        return {'ok': False, 'error': f"unknown op {op!r}"}
+
+    async def submit(self, request):
+        player = str(request.get("player") or "").strip()[:MAX_PLAYER_NAME]
+        if not player:
+            return {'ok': False, 'error': "missing player"}
+        encoded = request.get("replay")
+        if not isinstance(encoded, str):
+            return {'ok': False, 'error': "replay must be base64 text"}
+        try:
+            data = base64.b64decode(encoded, validate=True)
+            replay = Replay.from_bytes(data)
+        except (ValueError, binascii.Error, struct.error) as e:
+            return {'ok': False, 'error': f"bad replay: {e}"}
+        level_path = self.levels.get(replay.level_hash)
+        if level_path is None:
+            return {'ok': False, 'error': "unknown level (or a changed version of one)"}
+        if replay.end_frame > MAX_REPLAY_FRAMES:
+            return {'ok': False, 'error': "replay too long"}
+        errors = launch_errors(replay, MAX_REPLAY_LAUNCHES)
+        if errors:
+            return {'ok': False, 'error': "impossible replay: " + "; ".join(errors[:5])}
+        busy = {'ok': False, 'error': "busy", 'retry_after': STATUS_POLL_INTERVAL * 4}
+        if self.queue.full():
+            return busy
+
+        submission_id = await self.db(self.store.add, player, replay.level_hash, replay.score)
+        try:
+            self.queue.put_nowait((submission_id, level_path, data))
+        except asyncio.QueueFull:  # Filled up while the row was being written
+            await self.db(self.store.finish, submission_id, {'ok': False, 'error': "busy"})
+            return busy
+        return {'ok': True, 'id': submission_id, 'status': "queued"}
+
+    async def status(self, request):
+        submission_id = request.get("id")
+        if not isinstance(submission_id, int) or isinstance(submission_id, bool):
+            return {'ok': False, 'error': "id must be an integer"}
+        submission = await self.db(self.store.get, submission_id)
+        if submission is None:
+            return {'ok': False, 'error': "no such submission"}
+        return {'ok': True, **submission}
+
+
+async def serve(args):
+    levels = level_index(args.levels)
+    server = LeaderboardServer(levels, ResultsStore(args.db), args.workers, args.queue)
+    await server.start(args.host, args.port)
+    print(f"Leaderboard on {args.host}:{args.port}: {len(levels)} levels, "
+          f"{server.worker_count} workers, results in {args.db}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+async def request(host, port, *messages):
+    """Send requests over one connection and return the responses."""
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    try:
+        responses = []
+        for message in messages:
+            writer.write(json.dumps(message).encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        return responses
+    finally:
+        writer.close()
+
+
+async def submit(path, player, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Submit a replay file and wait for its verdict; returns the final status response."""
+    with open(path, 'rb') as f:
+        encoded = base64.b64encode(f.read()).decode("ascii")
+    while True:
+        (response,) = await request(host, port, {"op": "submit", "player": player, "replay": encoded})
+        if response.get('error') != "busy":
+            break
+        await asyncio.sleep(response['retry_after'])
+    if not response['ok']:
+        return response
+    while response.get('status') == "queued":
+        await asyncio.sleep(STATUS_POLL_INTERVAL)
+        (response,) = await request(host, port, {"op": "status", "id": response['id']})
+    return response
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify replay scores and keep a leaderboard.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the server")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--levels", default="assets/levels", help="Folder of the levels to accept")
+    serve_parser.add_argument("--db", default=":memory:", help="SQLite file for results")
+    serve_parser.add_argument("--workers", type=int, default=None,
+                              help="Worker processes (0 verifies on a thread of the server)")
+    serve_parser.add_argument("--queue", type=int, default=QUEUE_SIZE, help="Replays waiting before submits are refused")
+
+    submit_parser = commands.add_parser("submit", help="Submit a replay and wait for the result")
+    submit_parser.add_argument("file")
+    submit_parser.add_argument("--player", required=True)
+    submit_parser.add_argument("--host", default=DEFAULT_HOST)
+    submit_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    top_parser = commands.add_parser("top", help="Show the best scores on a level")
+    top_parser.add_argument("level", help="Level hash")
+    top_parser.add_argument("--limit", type=int, default=10)
+    top_parser.add_argument("--host", default=DEFAULT_HOST)
+    top_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.command == "submit":
+        result = asyncio.run(submit(args.file, args.player, args.host, args.port))
+        if result.get('status') == "verified":
+            print(f"Verified: {result['score']} points")
+            return 0
+        print(f"Rejected: {result.get('error')}")
+        return 1
+
+    (response,) = asyncio.run(request(args.host, args.port,
+                                      {"op": "leaderboard", "level": args.level, "limit": args.limit}))
+    if not response['ok']:
+        print(response['error'])
+        return 1
+    for rank, entry in enumerate(response['scores'], 1):
+        print(f"{rank:3}. {entry['player']:<{MAX_PLAYER_NAME}} {entry['score']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
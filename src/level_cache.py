@@ -0,0 +1,242 @@
+# src/level_cache.py
+"""
+Compiled level cache.
+
+Parsing a .tmx with arcade.load_tilemap also loads every tileset image, which
+is most of the level load time. The game only needs the rectangles of the
+"Bamboo", "Wood", "Monkeys" and "Ground" object layers, so each level is
+compiled once into a small binary file of array-backed records
+(kind, x, y, w, h) and read back in a single bulk read. Ground rectangles, and
+objects given a `static` bool property in Tiled, are flagged static: they
+become fixed level geometry instead of bodies. Run `python -m src.level_cache`
+to precompile.
+
+File layout (records in native byte order; the cache is machine-local):
+    header   magic, version, record count, source mtime_ns, source size, sha1
+    kinds    count x uint8
+    flags    count x uint8 (FLAG_STATIC)
+    rects    count x 4 x float32 (x, y, w, h; bottom-left corner, arcade coords)
+"""
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from array import array
+
+CACHE_DIR_NAME = ".cache"
+CACHE_EXT = ".lvl"
+MAGIC = b"BLVL"
+VERSION = 2  # 2: Ground records and per-record flags
+HEADER = struct.Struct("<4sHIqq20s")
+
+# --- Record kinds ---
+KIND_BAMBOO = 0
+KIND_WOOD = 1
+KIND_MONKEY = 2
+KIND_GROUND = 3
+
+# --- Record flags ---
+FLAG_STATIC = 1  # Part of the fixed level geometry, never a dynamic body
+
+# Object layer name in Tiled -> record kind
+LAYER_KINDS = {
+    "Bamboo": KIND_BAMBOO,
+    "Wood": KIND_WOOD,
+    "Monkeys": KIND_MONKEY,
+    "Ground": KIND_GROUND,
+}
+
+
+class LevelData:
+    """The compiled object layers of one level."""
+
+    def __init__(self, kinds, rects, source_hash, flags=None):
+        self.kinds = kinds  # array('B')
+        self.flags = flags if flags is not None else array('B', bytes(len(kinds)))
+        self.rects = rects  # array('f'), 4 floats per record
+        self.hash = source_hash
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def records(self, kind=None, static=None):
+        """
+        Yield (kind, x, y, w, h) for every record, optionally of one kind
+        only and/or only the static (True) or dynamic (False) ones.
+        """
+        rects = self.rects
+        flags = self.flags
+        for i, record_kind in enumerate(self.kinds):
+            if kind is not None and record_kind != kind:
+                continue
+            if static is not None and bool(flags[i] & FLAG_STATIC) != static:
+                continue
+            j = i * 4
+            yield record_kind, rects[j], rects[j + 1], rects[j + 2], rects[j + 3]
+
+    def count(self, kind):
+        return self.kinds.count(kind)
+
+
+def cache_path(tmx_path):
+    """Where the compiled form of a level lives: a .cache folder beside it."""
+    folder, name = os.path.split(tmx_path)
+    base = os.path.splitext(name)[0]
+    return os.path.join(folder, CACHE_DIR_NAME, base + CACHE_EXT)
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def parse_tmx(tmx_path):
+    """Read the object layers straight from the .tmx XML."""
+    root = ET.parse(tmx_path).getroot()
+    map_height = int(root.get("height")) * int(root.get("tileheight"))
+
+    kinds = array('B')
+    flags = array('B')
+    rects = array('f')
+
+    def walk(element, offset_x, offset_y):
+        for child in element:
+            if child.tag not in ("group", "objectgroup"):
+                continue
+            child_x = offset_x + float(child.get("offsetx", 0))
+            child_y = offset_y + float(child.get("offsety", 0))
+            if child.tag == "group":
+                walk(child, child_x, child_y)
+                continue
+            kind = LAYER_KINDS.get(child.get("name"))
+            if kind is None:
+                continue
+            for obj in child.iter("object"):
+                w = float(obj.get("width", 0))
+                h = float(obj.get("height", 0))
+                x = float(obj.get("x")) + child_x
+                # Tiled's y axis points down from the top-left corner
+                y = map_height - (float(obj.get("y")) + child_y) - h
+                # Monkeys always move; blocks can be pinned in place
+                static = kind == KIND_GROUND or kind != KIND_MONKEY and any(
+                    prop.get("name") == "static" and prop.get("value") == "true"
+                    for prop in obj.iterfind("properties/property")
+                )
+                kinds.append(kind)
+                flags.append(FLAG_STATIC if static else 0)
+                rects.extend((x, y, w, h))
+
+    walk(root, 0.0, 0.0)
+    return kinds, flags, rects
+
+
+def compile_level(tmx_path):
+    """Parse a level and write its cache file. Returns the LevelData."""
+    kinds, flags, rects = parse_tmx(tmx_path)
+    stat = os.stat(tmx_path)
+    digest = file_hash(tmx_path)
+    write_cache(cache_path(tmx_path), kinds, flags, rects, stat, digest)
+    return LevelData(kinds, rects, digest.hex(), flags)
+
+
+def atomic_write(path, write, mode='wb'):
+    """
+    Call write(f) on a temp file of its own next to `path`, then rename it over `path`.
+
+    Several processes or threads can write the same file at once (the solver's
+    workers, the loader and the registry may all compile one level): each has
+    its own temp file and readers only ever see a complete file.
+    """
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix="." + os.path.basename(path) + "-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_cache(path, kinds, flags, rects, stat, digest):
+    header = HEADER.pack(MAGIC, VERSION, len(kinds), stat.st_mtime_ns, stat.st_size, digest)
+
+    def write(f):
+        f.write(header)
+        f.write(kinds.tobytes())
+        f.write(flags.tobytes())
+        f.write(rects.tobytes())
+
+    atomic_write(path, write)
+
+
+def read_cache(path):
+    """
+    Read a cache file in one go.
+
+    Returns (count, mtime_ns, size, digest, kinds, flags, rects), or None if the
+    file is missing, truncated or from another format version.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+
+    magic, version, count, mtime_ns, size, digest = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    kinds_end = HEADER.size + count
+    flags_end = kinds_end + count
+    rects_end = flags_end + count * 16
+    if len(data) != rects_end:
+        return None
+
+    view = memoryview(data)
+    kinds = array('B')
+    kinds.frombytes(view[HEADER.size:kinds_end])
+    flags = array('B')
+    flags.frombytes(view[kinds_end:flags_end])
+    rects = array('f')
+    rects.frombytes(view[flags_end:rects_end])
+    return count, mtime_ns, size, digest, kinds, flags, rects
+
+
+def load_level(tmx_path):
+    """
+    Load a level's object layers, from the cache when it is still valid.
+
+    The cache is trusted when the source's mtime and size match. If only the
+    mtime changed, the content hash decides whether to recompile.
+    """
+    path = cache_path(tmx_path)
+    cached = read_cache(path)
+    if cached is not None:
+        _, mtime_ns, size, digest, kinds, flags, rects = cached
+        stat = os.stat(tmx_path)
+        if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+            return LevelData(kinds, rects, digest.hex(), flags)
+        if stat.st_size == size and file_hash(tmx_path) == digest:
+            # Touched but unchanged: refresh the stamp, keep the records
+            write_cache(path, kinds, flags, rects, stat, digest)
+            return LevelData(kinds, rects, digest.hex(), flags)
+    return compile_level(tmx_path)
+
+
+def main(argv=None):
+    import glob
+    argv = sys.argv[1:] if argv is None else argv
+    levels = argv or sorted(glob.glob(os.path.join("assets", "levels", "*.tmx")))
+    for tmx_path in levels:
+        level = compile_level(tmx_path)
+        print(f"Compiled {tmx_path} -> {cache_path(tmx_path)} ({len(level)} records)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# src/level_registry.py
+"""
+Registry of the playable levels.
+
+One os.scandir of the levels folder finds every .tmx file. What we know about
+each one (number, title, enemy/block counts, hash) is kept in a manifest next
+to the compiled level cache and only recomputed for files whose mtime or size
+changed. Files named levelN.tmx keep number N, gaps and all; any other .tmx
+files are numbered after them in name order.
+"""
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from src import level_cache
+
+LEVELS_DIR = "assets/levels"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+NUMBERED_NAME = re.compile(r"^level(\d+)\.tmx$", re.IGNORECASE)
+
+
+class LevelEntry:
+    """Metadata for one level file."""
+
+    FIELDS = ("number", "path", "title", "enemies", "blocks", "hash", "mtime_ns", "size", "thumbnail")
+
+    def __init__(self, number=None, path=None, title=None, enemies=0, blocks=0,
+                 hash=None, mtime_ns=0, size=0, thumbnail=None):
+        self.number = number
+        self.path = path
+        self.title = title
+        self.enemies = enemies
+        self.blocks = blocks
+        self.hash = hash
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.thumbnail = thumbnail
+
+    @property
+    def display_title(self):
+        """The Tiled title if set, else "Level N" for levelN.tmx, else the file name."""
+        if self.title:
+            return self.title
+        name = os.path.basename(self.path)
+        if NUMBERED_NAME.match(name):
+            return f"Level {self.number}"
+        return os.path.splitext(name)[0]
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+
+def read_title(path):
+    """The map's "title" custom property from Tiled, if it has one."""
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return None
+    for prop in root.iterfind("properties/property"):
+        if prop.get("name") == "title":
+            return prop.get("value") or prop.text
+    return None
+
+
+class LevelRegistry:
+    """Finds level files and keeps their metadata in an on-disk manifest."""
+
+    def __init__(self, levels_dir=LEVELS_DIR):
+        self.levels_dir = levels_dir
+        self.manifest_path = os.path.join(levels_dir, level_cache.CACHE_DIR_NAME, MANIFEST_NAME)
+        self.levels = []
+        self.by_number = {}
+        self.manifest = None  # Read from disk on the first refresh()
+
+    def load_manifest(self):
+        """Known entries keyed by file name; empty if the manifest is missing or stale."""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return {name: LevelEntry.from_dict(entry) for name, entry in data.get("levels", {}).items()}
+
+    def save_manifest(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "levels": {name: entry.to_dict() for name, entry in self.manifest.items()},
+        }
+        level_cache.atomic_write(self.manifest_path, lambda f: json.dump(data, f, indent=1), 'w')
+
+    def refresh(self):
+        """Rescan the levels folder, re-reading only new or changed files."""
+        if not os.path.isdir(self.levels_dir):
+            print(f"Warning: {self.levels_dir} directory not found!")
+            self.levels = []
+            self.by_number = {}
+            return self.levels
+
+        if self.manifest is None:
+            self.manifest = self.load_manifest()
+
+        changed = False
+        found = {}
+        with os.scandir(self.levels_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.is_file() or not dir_entry.name.lower().endswith(".tmx"):
+                    continue
+                stat = dir_entry.stat()
+                entry = self.manifest.get(dir_entry.name)
+                if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                    entry = self.read_entry(dir_entry.path, stat)
+                    changed = True
+                    if entry is None:
+                        continue  # Broken file: left out until it changes again
+                found[dir_entry.name] = entry
+
+        if found.keys() != self.manifest.keys():
+            changed = True
+        self.manifest = found
+        self.assign_numbers()
+        if changed:
+            self.save_manifest()
+        return self.levels
+
+    def read_entry(self, path, stat):
+        """Compile a level and collect its metadata, or None if the file can't be read."""
+        try:
+            level = level_cache.load_level(path)
+        except Exception as e:
+            # A malformed or half-saved .tmx shouldn't take the level select down with it
+            print(f"Warning: skipping level {path}: {e}")
+            return None
+        return LevelEntry(
+            path=path,
+            title=read_title(path),
+            enemies=level.count(level_cache.KIND_MONKEY),
+            blocks=level.count(level_cache.KIND_BAMBOO) + level.count(level_cache.KIND_WOOD),
+            hash=level.hash,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+        )
+
+    def assign_numbers(self):
+        """levelN.tmx keeps N; other files follow the highest N in name order."""
+        numbered = []
+        others = []
+        for name, entry in self.manifest.items():
+            match = NUMBERED_NAME.match(name)
+            if match:
+                entry.number = int(match.group(1))
+                numbered.append(entry)
+            else:
+                others.append((name, entry))
+
+        next_number = max((entry.number for entry in numbered), default=0) + 1
+        for name, entry in sorted(others):
+            entry.number = next_number
+            next_number += 1
+            numbered.append(entry)
+
+        self.levels = sorted(numbered, key=lambda entry: entry.number)
+        self.by_number = {entry.number: entry for entry in self.levels}
+
+    def get(self, number):
+        return self.by_number.get(number)
+
+    def next_number(self, number):
+        """Number of the level after `number`, skipping gaps; None after the last one."""
+        for entry in self.levels:
+            if entry.number > number:
+                return entry.number
+        return None
+
+
+# Global level registry instance
+registry = LevelRegistry()
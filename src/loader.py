@@ -0,0 +1,106 @@
+# src/loader.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+from src import constants as c
+from src import level_cache
+from src import terrain
+from src.profiler import profiler
+from src.simulation import Simulation
+
+# Share of the progress bar covered once each stage is done
+PARSED_PROGRESS = 0.3
+BUILT_PROGRESS = 0.7
+
+
+class LevelLoad:
+    """
+    One level being prepared.
+
+    Parsing, image decoding and building the physics world run on the loader's
+    worker thread. Uploading textures to the GPU has to happen on the main
+    thread, so upload_step() does it a little at a time, once per frame.
+    """
+
+    def __init__(self, map_file, executor):
+        self.map_file = map_file
+        self.progress = 0.0
+        self.sim = None
+        self.pending_uploads = None
+        self.total_uploads = 0
+        self.future = executor.submit(self._build)
+
+    def _build(self):
+        """Worker thread: everything that doesn't need the OpenGL context."""
+        with profiler.section("load.parse"):
+            level_cache.load_level(self.map_file)
+        self.progress = PARSED_PROGRESS
+        with profiler.section("load.build"):
+            sim = Simulation(self.map_file)
+            sim.prefill()
+        with profiler.section("load.bake"):
+            terrain.prepare(sim)
+        self.progress = BUILT_PROGRESS
+        return sim
+
+    @property
+    def failed(self):
+        return self.future.done() and self.future.exception() is not None
+
+    def upload_step(self, time_budget=c.LOADING_FRAME_BUDGET):
+        """
+        Main thread: upload textures and sprite buffers until the time budget runs out.
+
+        Returns True once the level is ready to play.
+        """
+        if not self.future.done():
+            return False
+
+        if self.sim is None:
+            self.sim = self.future.result()
+            sprite_lists = self.sim.sprite_lists()
+            textures = {sprite.texture for sprite_list in sprite_lists for sprite in sprite_list}
+            textures.update(sprite.texture for sprite in self.sim.pooled_sprites())
+            # Textures first, then each list's GPU buffers
+            self.pending_uploads = list(sprite_lists) + list(textures)
+            self.total_uploads = len(self.pending_uploads)
+
+        atlas = arcade.get_window().ctx.default_atlas
+        start = time.perf_counter()
+        with profiler.section("load.upload"):
+            while self.pending_uploads and time.perf_counter() - start < time_budget:
+                item = self.pending_uploads.pop()
+                if isinstance(item, arcade.SpriteList):
+                    item.initialize()
+                else:
+                    atlas.add(item)
+
+        done = self.total_uploads - len(self.pending_uploads)
+        self.progress = BUILT_PROGRESS + (1.0 - BUILT_PROGRESS) * done / max(1, self.total_uploads)
+        return not self.pending_uploads
+
+
+class LevelLoader:
+    """Runs level loads on a background thread and keeps prefetched levels ready."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-loader")
+        self.prefetched = {}
+
+    def load(self, map_file):
+        """Start loading a level, reusing a prefetch of it if there is one."""
+        job = self.prefetched.pop(map_file, None)
+        if job is None or job.failed:
+            job = LevelLoad(map_file, self.executor)
+        return job
+
+    def prefetch(self, map_file):
+        """Start building a level in the background before the player asks for it."""
+        if map_file and os.path.exists(map_file) and map_file not in self.prefetched:
+            self.prefetched[map_file] = LevelLoad(map_file, self.executor)
+
+
+# Global level loader instance
+level_loader = LevelLoader()
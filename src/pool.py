@@ -0,0 +1,32 @@
+# src/pool.py
+"""
+Free lists of physics sprites.
+
+A sprite taken out of the world is kept together with the pymunk body and
+shape it had, so putting it back in costs a state reset instead of a new
+Sprite, body and shape (and the garbage they leave behind).
+"""
+
+
+class SpritePool:
+    """Reusable sprites of one kind, each with its old physics object (or None if it never had one)."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []  # (sprite, physics object)
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        """A free (sprite, physics object) pair, or a new sprite and None when the pool is empty."""
+        if self.free:
+            self.reused += 1
+            return self.free.pop()
+        self.created += 1
+        return self.factory(), None
+
+    def release(self, sprite, physics_object):
+        self.free.append((sprite, physics_object))
+
+    def __len__(self):
+        return len(self.free)
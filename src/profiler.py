@@ -0,0 +1,135 @@
+# src/profiler.py
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+from src import constants as c
+
+_DISABLED = nullcontext()
+
+
+class _Section:
+    """Times one `with profiler.section(name):` block."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """
+    Opt-in timing of hot paths.
+
+    Keeps a rolling window of durations per section for the p50/p95/p99
+    overlay and a list of Chrome trace events (open in chrome://tracing or
+    Perfetto) written out on exit. Costs almost nothing while disabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.overlay_visible = False
+        self.samples = {}  # name -> deque of durations in seconds
+        self.events = []
+        self.dropped_events = 0
+        self.origin = time.perf_counter()
+        self.overlay_text = None
+        self.overlay_updated = 0.0
+
+    def enable(self):
+        self.enabled = True
+        self.origin = time.perf_counter()
+
+    def section(self, name):
+        """Context manager timing a block under `name`."""
+        if not self.enabled:
+            return _DISABLED
+        return _Section(self, name)
+
+    def record(self, name, start, end):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=c.PROFILER_WINDOW)
+        samples.append(end - start)
+
+        if len(self.events) < c.PROFILER_MAX_TRACE_EVENTS:
+            self.events.append((name, start, end, threading.get_ident()))
+        else:
+            self.dropped_events += 1
+
+    def percentiles(self, name):
+        """(p50, p95, p99) of the recent durations of a section, in seconds."""
+        ordered = sorted(self.samples.get(name, ()))
+        if not ordered:
+            return 0.0, 0.0, 0.0
+        last = len(ordered) - 1
+        return (ordered[int(last * 0.50)],
+                ordered[int(last * 0.95)],
+                ordered[int(last * 0.99)])
+
+    # --- Overlay ---
+    def toggle_overlay(self):
+        if self.enabled:
+            self.overlay_visible = not self.overlay_visible
+
+    def draw_overlay(self, extra_lines=()):
+        """Draw the stats table; the text is only re-laid out a few times a second."""
+        if not (self.enabled and self.overlay_visible):
+            return
+        import arcade
+
+        now = time.perf_counter()
+        if self.overlay_text is None or now - self.overlay_updated > c.PROFILER_OVERLAY_REFRESH:
+            self.overlay_updated = now
+            lines = [f"{'section':<24}{'p50':>8}{'p95':>8}{'p99':>8}  (ms)"]
+            for name in sorted(self.samples):
+                p50, p95, p99 = self.percentiles(name)
+                lines.append(f"{name:<24}{p50 * 1000:8.2f}{p95 * 1000:8.2f}{p99 * 1000:8.2f}")
+            lines.extend(extra_lines)
+            text = "\n".join(lines)
+            if self.overlay_text is None:
+                self.overlay_text = arcade.Text(
+                    text, 10, c.SCREEN_HEIGHT - 60,
+                    arcade.color.BLACK,
+                    font_size=10,
+                    font_name=("Courier New", "Courier", "monospace"),
+                    multiline=True,
+                    width=c.SCREEN_WIDTH - 20,
+                    anchor_y="top"
+                )
+            else:
+                self.overlay_text.text = text
+        self.overlay_text.draw()
+
+    # --- Trace export ---
+    def write_trace(self, path=c.PROFILER_TRACE_FILE):
+        """Write everything recorded so far as Chrome trace JSON."""
+        if not self.enabled:
+            return
+        trace_events = [{
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": 0,
+            "tid": tid,
+        } for name, start, end, tid in self.events]
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+        print(f"Wrote {len(trace_events)} trace events to {path}"
+              + (f" ({self.dropped_events} dropped)" if self.dropped_events else ""))
+
+
+# Global profiler instance
+profiler = Profiler()
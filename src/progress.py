@@ -1,45 +1,201 @@
 # src/progress.py
+import atexit
 import json
 import os
+import sys
+import tempfile
+import threading
+
+from src import constants as c
 
 PROGRESS_FILE = "progress.json"
+LEGACY_PROGRESS_FILE = "progress.json"  # Old location, relative to the working directory
+SCHEMA_VERSION = 1
+
+
+def user_data_dir():
+    """Per-user folder for save data (BANANA_DATA_DIR overrides it)."""
+    override = os.environ.get("BANANA_DATA_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        return os.path.join(base, c.DATA_DIR_NAME)
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~/Library/Application Support"), c.DATA_DIR_NAME)
+    base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, c.DATA_DIR_NAME.lower().replace(" ", "-"))
+
+
+# --- Schema migrations: each takes the data at version N and returns version N + 1 ---
+def _migrate_v0(data):
+    """v0 (no version field) only had the unlocked level list."""
+    return {
+        'version': 1,
+        'unlocked_levels': data.get('unlocked_levels', [1]),
+        'levels': {},
+    }
+
+
+MIGRATIONS = {
+    0: _migrate_v0,
+}
+
+
+def migrate(data):
+    """Bring saved data of any older version up to SCHEMA_VERSION."""
+    if not isinstance(data, dict):
+        raise ValueError("progress data is not a JSON object")
+    version = data.get('version', 0)
+    while version < SCHEMA_VERSION:
+        data = MIGRATIONS[version](data)
+        version = data['version']
+    return data
+
+
+def atomic_write_json(path, data):
+    """Write JSON to a temp file next to `path`, then rename it over `path`."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".progress-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 class ProgressTracker:
-    """Tracks which levels are unlocked."""
+    """
+    Tracks which levels are unlocked and the best result on each.
+
+    Changes are written by a background timer a moment after they happen
+    (several changes in a row become one write), and once more at exit.
+    The file is only read on first use, so importing this module is cheap.
+    `lock` guards the unlocked levels and stats, which the timer thread
+    copies while the game changes them.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(user_data_dir(), PROGRESS_FILE)
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()  # One write at a time, in snapshot order
+        self.flush_timer = None
+        self.unlocked_levels = {1}
+        self.level_stats = {}  # level number -> {'best_score', 'fewest_bananas', 'best_time'}
+        self.loaded = False
+        atexit.register(self.flush)
 
-    def __init__(self):
-        self.unlocked_levels = self.load_progress()
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.loaded = True
+            self.load_progress()
 
     def load_progress(self):
-        """Load progress from file, or return default if file doesn't exist."""
-        if os.path.exists(PROGRESS_FILE):
-            try:
-                with open(PROGRESS_FILE, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('unlocked_levels', [1]))
-            except:
-                return {1}  # Default: only level 1 unlocked
-        return {1}
+        """Load progress from file, falling back to the old location, or defaults."""
+        path = self.path
+        if not os.path.exists(path) and os.path.exists(LEGACY_PROGRESS_FILE):
+            path = LEGACY_PROGRESS_FILE
+        if not os.path.exists(path):
+            return
+
+        try:
+            with open(path, 'r') as f:
+                data = migrate(json.load(f))
+            unlocked_levels = set(data.get('unlocked_levels', [1])) or {1}
+            level_stats = {int(number): dict(stats) for number, stats in data.get('levels', {}).items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # Keep the unreadable file for inspection rather than overwriting it
+            print(f"Warning: could not read {path} ({e}); starting fresh")
+            if os.path.exists(path):
+                os.replace(path, path + ".corrupt")
+            return
+
+        with self.lock:
+            self.unlocked_levels = unlocked_levels
+            self.level_stats = level_stats
+        if path != self.path:
+            self.schedule_save()  # Move the legacy file's contents to the new location
+
+    def to_dict(self):
+        """A copy of the progress to save; call with `lock` held."""
+        return {
+            'version': SCHEMA_VERSION,
+            'unlocked_levels': sorted(self.unlocked_levels),
+            'levels': {str(number): dict(stats) for number, stats in self.level_stats.items()},
+        }
 
     def save_progress(self):
-        """Save progress to file."""
-        with open(PROGRESS_FILE, 'w') as f:
-            json.dump({'unlocked_levels': list(self.unlocked_levels)}, f)
+        """Write progress to disk now."""
+        # The copy is taken and written under save_lock, so an older copy can
+        # never be written over a newer one
+        with self.save_lock:
+            with self.lock:
+                data = self.to_dict()
+            atomic_write_json(self.path, data)
+
+    def schedule_save(self):
+        """Save soon, off the game loop; repeated calls before then share one write."""
+        with self.lock:
+            if self.flush_timer is not None:
+                return
+            self.flush_timer = threading.Timer(c.PROGRESS_SAVE_DELAY, self.flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+
+    def flush(self):
+        """Write any pending changes now."""
+        with self.lock:
+            timer = self.flush_timer
+            self.flush_timer = None
+        if timer is None:
+            return
+        timer.cancel()
+        try:
+            self.save_progress()
+        except OSError as e:
+            print(f"Warning: could not save progress to {self.path}: {e}")
 
     def unlock_level(self, level_number):
         """Unlock a specific level."""
-        self.unlocked_levels.add(level_number)
-        self.save_progress()
+        self.ensure_loaded()
+        with self.lock:
+            if level_number in self.unlocked_levels:
+                return
+            self.unlocked_levels.add(level_number)
+        self.schedule_save()
 
     def is_level_unlocked(self, level_number):
         """Check if a level is unlocked."""
+        self.ensure_loaded()
         return level_number in self.unlocked_levels
 
-    def complete_level(self, level_number):
+    def get_stats(self, level_number):
+        """Best results on a level, or None if it was never completed."""
+        self.ensure_loaded()
+        return self.level_stats.get(level_number)
+
+    def record_result(self, level_number, score, bananas_used, seconds):
+        """Keep the best score, fewest bananas and best time seen on a level."""
+        self.ensure_loaded()
+        with self.lock:
+            stats = self.level_stats.setdefault(level_number, {})
+            stats['best_score'] = max(score, stats.get('best_score', score))
+            stats['fewest_bananas'] = min(bananas_used, stats.get('fewest_bananas', bananas_used))
+            stats['best_time'] = round(min(seconds, stats.get('best_time', seconds)), 3)
+        self.schedule_save()
+
+    def complete_level(self, level_number, next_level_number=None):
         """Mark a level as complete and unlock the next one."""
-        self.unlock_level(level_number + 1)
+        if next_level_number is None:
+            next_level_number = level_number + 1
+        self.unlock_level(next_level_number)
 
 
 # Global progress tracker instance
-progress = ProgressTracker()
\ No newline at end of file
+progress = ProgressTracker()
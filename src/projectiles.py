@@ -0,0 +1,140 @@
+# src/projectiles.py
+"""
+Banana types, loaded from assets/projectiles.json.
+
+Each type declares its texture, physics (mass, damping, friction) and an
+optional effect: "split" into several bananas of another type, or "explode"
+and push everything within a radius. Effects fire when the banana reaches the
+top of its arc ("apex") or first touches something ("impact"). The file is
+read and checked once; any mistake in it is reported all together.
+"""
+import json
+import os
+
+PROJECTILES_FILE = "assets/projectiles.json"
+FILE_VERSION = 1
+EFFECTS = (None, "split", "explode")
+TRIGGERS = ("apex", "impact")
+
+
+class ProjectileType:
+    """One kind of banana."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.texture = data["texture"]
+        self.scale = float(data.get("scale", 1.0))
+        self.color = tuple(data["color"]) if data.get("color") else None
+        self.mass = float(data["mass"])
+        self.damping = float(data["damping"])
+        self.friction = float(data["friction"])
+        self.effect = data.get("effect")
+        self.trigger = data.get("trigger")
+        split = data.get("split", {})
+        self.split_count = split.get("count", 0)
+        self.split_spread = split.get("spread", 0.0)
+        self.split_into = split.get("into")
+        explode = data.get("explode", {})
+        self.explode_radius = explode.get("radius", 0.0)
+        self.explode_impulse = explode.get("impulse", 0.0)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate(data):
+    """Every problem with a projectiles file, as a list of messages."""
+    if not isinstance(data, dict):
+        return ["the file must hold a JSON object"]
+    errors = []
+    if data.get("version") != FILE_VERSION:
+        errors.append(f"version must be {FILE_VERSION}")
+    types = data.get("projectiles")
+    if not isinstance(types, dict) or not types:
+        return errors + ["'projectiles' must be a non-empty object"]
+
+    for name, entry in types.items():
+        def error(message):
+            errors.append(f"{name}: {message}")
+
+        if not isinstance(entry, dict):
+            error("must be an object")
+            continue
+        if not isinstance(entry.get("texture"), str):
+            error("texture must be a path")
+        elif not os.path.exists(entry["texture"]):
+            error(f"texture {entry['texture']} not found")
+        if not _is_number(entry.get("mass")) or entry["mass"] <= 0:
+            error("mass must be a positive number")
+        if not _is_number(entry.get("scale", 1.0)) or entry.get("scale", 1.0) <= 0:
+            error("scale must be a positive number")
+        if not _is_number(entry.get("damping")) or not 0 < entry["damping"] <= 1:
+            error("damping must be in (0, 1]")
+        if not _is_number(entry.get("friction")) or entry["friction"] < 0:
+            error("friction must be zero or more")
+        color = entry.get("color")
+        if color is not None and (not isinstance(color, list) or len(color) not in (3, 4)
+                                  or not all(isinstance(v, int) and 0 <= v <= 255 for v in color)):
+            error("color must be 3 or 4 integers from 0 to 255")
+
+        effect = entry.get("effect")
+        if effect not in EFFECTS:
+            error(f"effect must be one of {EFFECTS}")
+            continue
+        if effect is None:
+            continue
+        if entry.get("trigger") not in TRIGGERS:
+            error(f"trigger must be one of {TRIGGERS}")
+        params = entry.get(effect)
+        if not isinstance(params, dict):
+            error(f"'{effect}' settings are missing")
+            continue
+        if effect == "split":
+            if not isinstance(params.get("count"), int) or params["count"] < 2:
+                error("split count must be an integer of at least 2")
+            if not _is_number(params.get("spread", 0)):
+                error("split spread must be a number of degrees")
+            into = params.get("into")
+            if not isinstance(into, str) or into not in types:
+                error(f"split into unknown type {into!r}")
+            elif isinstance(types[into], dict) and types[into].get("effect") == "split":
+                error("cannot split into a type that splits again")
+        elif effect == "explode":
+            for field in ("radius", "impulse"):
+                if not _is_number(params.get(field)) or params[field] <= 0:
+                    error(f"explode {field} must be a positive number")
+    return errors
+
+
+class ProjectileRegistry:
+    """All banana types, in the order the file lists them."""
+
+    def __init__(self, path=PROJECTILES_FILE):
+        self.path = path
+        self.types = {}
+
+    def load(self):
+        """Read and validate the file; raises ValueError listing every problem."""
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        errors = validate(data)
+        if errors:
+            raise ValueError(f"Invalid {self.path}:\n  " + "\n  ".join(errors))
+        self.types = {name: ProjectileType(name, entry) for name, entry in data["projectiles"].items()}
+        return self
+
+    @property
+    def names(self):
+        if not self.types:
+            self.load()
+        return list(self.types)
+
+    def get(self, name):
+        if not self.types:
+            self.load()
+        return self.types[name]
+
+
+# Global projectile registry instance
+projectiles = ProjectileRegistry()
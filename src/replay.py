@@ -0,0 +1,298 @@
+# src/replay.py
+"""
+Deterministic replays.
+
+A replay is the level (path and content hash), the simulation seed and every
+launch as (physics frame, impulse). Because the Simulation steps at a fixed
+timestep, feeding the same launches in on the same frames reproduces the
+session exactly. Usage:
+
+    python -m src.replay FILE_OR_DIR ... [--realtime] [--workers N]
+    python -m src.replay FILE --watch
+
+Each replay is re-simulated headlessly (fast-forward unless --realtime) and
+its outcome compared with the one recorded when it was made; the exit code is
+non-zero if any differ. --watch opens a window and plays one replay back.
+"""
+import argparse
+import glob
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+MAGIC = b"BRPL"
+VERSION = 3  # 2: launches carry a banana type; 3: physics quality changes
+REPLAY_EXT = ".rpl"
+REPLAYS_DIR_NAME = "replays"
+# magic, version, seed, level sha1, end frame, launch count, cleared, score
+HEADER = struct.Struct("<4sHQ20sIIBi")
+PATH_LENGTH = struct.Struct("<H")
+NAME_LENGTH = struct.Struct("<B")  # Also used for the number of banana type names
+LAUNCH = struct.Struct("<IddB")  # frame, impulse x, impulse y, index into the type names
+QUALITY_COUNT = struct.Struct("<H")
+QUALITY_CHANGE = struct.Struct("<IB")  # frame, tier
+
+
+class ReplayMismatch(ValueError):
+    """The level a replay was recorded on has changed since."""
+
+
+class ImpossibleLaunch(ValueError):
+    """A replay throws a banana when the game would not have let the player."""
+
+
+class Replay:
+    """One recorded session."""
+
+    def __init__(self, level_path, level_hash, seed=0):
+        self.level_path = level_path
+        self.level_hash = level_hash
+        self.seed = seed
+        self.launches = []  # (frame, impulse_x, impulse_y, banana type)
+        self.quality_changes = []  # (frame, quality tier)
+        self.end_frame = 0
+        self.cleared = False
+        self.score = 0
+
+    def to_bytes(self):
+        path = self.level_path.replace(os.sep, "/").encode("utf-8")
+        parts = [
+            HEADER.pack(MAGIC, VERSION, self.seed, bytes.fromhex(self.level_hash),
+                        self.end_frame, len(self.launches), int(self.cleared), self.score),
+            PATH_LENGTH.pack(len(path)),
+            path,
+        ]
+        names = sorted({launch[3] for launch in self.launches})
+        parts.append(NAME_LENGTH.pack(len(names)))
+        for name in names:
+            encoded = name.encode("utf-8")
+            parts.extend((NAME_LENGTH.pack(len(encoded)), encoded))
+        index = {name: i for i, name in enumerate(names)}
+        parts.extend(LAUNCH.pack(frame, impulse_x, impulse_y, index[name])
+                     for frame, impulse_x, impulse_y, name in self.launches)
+        parts.append(QUALITY_COUNT.pack(len(self.quality_changes)))
+        parts.extend(QUALITY_CHANGE.pack(frame, tier) for frame, tier in self.quality_changes)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, digest, end_frame, count, cleared, score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a replay file, or from an unsupported version")
+        offset = HEADER.size
+        (path_length,) = PATH_LENGTH.unpack_from(data, offset)
+        offset += PATH_LENGTH.size
+        level_path = data[offset:offset + path_length].decode("utf-8")
+        offset += path_length
+        (name_count,) = NAME_LENGTH.unpack_from(data, offset)
+        offset += NAME_LENGTH.size
+        names = []
+        for _ in range(name_count):
+            (name_length,) = NAME_LENGTH.unpack_from(data, offset)
+            offset += NAME_LENGTH.size
+            names.append(data[offset:offset + name_length].decode("utf-8"))
+            offset += name_length
+
+        replay = cls(level_path, digest.hex(), seed)
+        for frame, impulse_x, impulse_y, name_index in LAUNCH.iter_unpack(data[offset:offset + count * LAUNCH.size]):
+            if name_index >= len(names):
+                raise ValueError(f"launch at frame {frame} names banana type {name_index} of {len(names)}")
+            replay.launches.append((frame, impulse_x, impulse_y, names[name_index]))
+        offset += count * LAUNCH.size
+        (quality_count,) = QUALITY_COUNT.unpack_from(data, offset)
+        offset += QUALITY_COUNT.size
+        replay.quality_changes = list(
+            QUALITY_CHANGE.iter_unpack(data[offset:offset + quality_count * QUALITY_CHANGE.size])
+        )
+        replay.end_frame = end_frame
+        replay.cleared = bool(cleared)
+        replay.score = score
+        return replay
+
+    def save(self, path):
+        from src import level_cache
+        data = self.to_bytes()
+        level_cache.atomic_write(path, lambda f: f.write(data))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def record(sim):
+    """A replay of everything launched in a Simulation so far, and how it stands now."""
+    if sim.level:
+        replay = Replay(sim.map_file, sim.level.hash, sim.seed)
+    else:
+        replay = Replay("", "00" * 20, sim.seed)
+    replay.launches = list(sim.launches)
+    replay.quality_changes = list(sim.quality_changes)
+    replay.end_frame = sim.frame
+    replay.cleared = sim.is_cleared
+    replay.score = sim.score()
+    return replay
+
+
+def launch_errors(replay, max_launches=None):
+    """
+    Every launch in a replay that the game could not have produced, as a list of messages.
+
+    A real throw is no stronger than a drag across the window, at least
+    LAUNCH_COOLDOWN_STEPS after the one before, of a known banana type and
+    before the end of the recording.
+    """
+    import math
+    from src import constants as c
+    from src.projectiles import projectiles
+
+    errors = []
+    if max_launches is not None and len(replay.launches) > max_launches:
+        errors.append(f"{len(replay.launches)} launches (at most {max_launches})")
+    known = set(projectiles.names)
+    previous = None
+    for frame, impulse_x, impulse_y, name in replay.launches:
+        strength = math.hypot(impulse_x, impulse_y)
+        if not math.isfinite(strength) or strength > c.MAX_THROW_IMPULSE * 1.000001:
+            errors.append(f"launch at frame {frame} is stronger than any throw")
+        if previous is not None and frame - previous < c.LAUNCH_COOLDOWN_STEPS:
+            errors.append(f"launch at frame {frame} follows the last one too soon")
+        if frame > replay.end_frame:
+            errors.append(f"launch at frame {frame} is after the end of the recording")
+        if name not in known:
+            errors.append(f"launch at frame {frame} uses an unknown banana type {name!r}")
+        previous = frame
+    return errors
+
+
+def replay_path(level_path):
+    """Where a new replay of a level is saved: the user data folder, one file per session."""
+    from src.progress import user_data_dir
+    name = os.path.splitext(os.path.basename(level_path))[0] or "default"
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(user_data_dir(), REPLAYS_DIR_NAME, f"{name}-{stamp}{REPLAY_EXT}")
+
+
+def play(replay, realtime=False, check_level=True):
+    """
+    Re-run a replay through a fresh headless Simulation.
+
+    With realtime=True each step waits out its timestep (for watching along
+    with logs); otherwise it runs as fast as possible. Returns the Simulation
+    in its final state. Raises ImpossibleLaunch for a throw made before the
+    level settled, which the game doesn't allow.
+    """
+    from src import level_cache
+    from src.simulation import Simulation
+
+    map_file = replay.level_path or None  # Empty path: the built-in default level
+    if check_level and map_file and level_cache.load_level(map_file).hash != replay.level_hash:
+        raise ReplayMismatch(f"{map_file} has changed since the replay was recorded")
+
+    sim = Simulation(map_file, verbose=False, seed=replay.seed)
+    launches = iter(replay.launches)
+    next_launch = next(launches, None)
+    changes = iter(replay.quality_changes)
+    next_change = next(changes, None)
+    start = time.perf_counter()
+    while sim.frame < replay.end_frame:
+        while next_change is not None and next_change[0] == sim.frame:
+            sim.set_quality(next_change[1])
+            next_change = next(changes, None)
+        while next_launch is not None and next_launch[0] == sim.frame:
+            if sim.settling:
+                raise ImpossibleLaunch(f"launch at frame {sim.frame} is before the level settled")
+            sim.launch((next_launch[1], next_launch[2]), next_launch[3])
+            next_launch = next(launches, None)
+        sim.step()
+        if realtime:
+            delay = start + sim.elapsed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    # A banana thrown just before the recording stopped still counts towards the score
+    while next_launch is not None and next_launch[0] == sim.frame:
+        if sim.settling:
+            raise ImpossibleLaunch(f"launch at frame {sim.frame} is before the level settled")
+        sim.launch((next_launch[1], next_launch[2]), next_launch[3])
+        next_launch = next(launches, None)
+    return sim
+
+
+def verify(path, realtime=False):
+    """Replay a file and compare the outcome with the recorded one."""
+    replay = Replay.load(path)
+    try:
+        sim = play(replay, realtime=realtime)
+    except (ReplayMismatch, ImpossibleLaunch) as e:
+        return {'file': path, 'ok': False, 'error': str(e)}
+    result = {
+        'file': path,
+        'cleared': sim.is_cleared,
+        'score': sim.score(),
+        'recorded_cleared': replay.cleared,
+        'recorded_score': replay.score,
+    }
+    result['ok'] = result['cleared'] == replay.cleared and result['score'] == replay.score
+    return result
+
+
+def watch(recording):
+    """Open a game window and play a replay back at normal speed."""
+    import arcade
+    from src import constants as c
+    from src.views.replay_view import ReplayView
+
+    window = arcade.Window(c.SCREEN_WIDTH, c.SCREEN_HEIGHT, c.SCREEN_TITLE)
+    view = ReplayView(recording)
+    view.setup()
+    window.show_view(view)
+    arcade.run()
+
+
+def find_replays(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*" + REPLAY_EXT), recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate replays and check their outcomes.")
+    parser.add_argument("paths", nargs="+", help="Replay files or folders of them")
+    parser.add_argument("--realtime", action="store_true", help="Run at real speed instead of fast-forward")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for bulk runs")
+    parser.add_argument("--watch", action="store_true", help="Play the first replay back in a window")
+    args = parser.parse_args(argv)
+
+    files = find_replays(args.paths)
+    if args.watch:
+        watch(Replay.load(files[0]))
+        return 0
+    if args.realtime or len(files) == 1:
+        results = [verify(path, realtime=args.realtime) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(verify, files, chunksize=8))
+
+    failures = 0
+    for result in results:
+        if result['ok']:
+            print(f"ok    {result['file']}")
+        else:
+            failures += 1
+            detail = result.get('error') or (
+                f"cleared {result['cleared']} (recorded {result['recorded_cleared']}), "
+                f"score {result['score']} (recorded {result['recorded_score']})"
+            )
+            print(f"FAIL  {result['file']}: {detail}")
+    print(f"{len(results) - failures}/{len(results)} replays reproduced")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
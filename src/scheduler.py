@@ -0,0 +1,73 @@
+# src/scheduler.py
+"""
+Adaptive physics quality.
+
+Simulation.update runs at most c.MAX_SUBSTEPS fixed steps a frame and drops
+any time beyond that, so a slow frame can't snowball into ever more steps.
+The scheduler on top of it times those steps. When physics takes more than
+c.PHYSICS_FRAME_BUDGET of a frame on average, the Simulation moves down a
+tier of c.QUALITY_TIERS (fewer solver iterations, damage and culling checked
+less often); when it falls well under budget again it moves back up. Changes
+are at least c.QUALITY_COOLDOWN apart so the tier doesn't flap.
+
+Tier changes are recorded by the Simulation like launches, so a replay of a
+session played at a lower tier re-simulates exactly.
+"""
+import time
+from collections import deque
+
+from src import constants as c
+
+
+class PhysicsScheduler:
+    """Steps a Simulation every frame and picks its quality tier."""
+
+    def __init__(self, sim, budget=c.PHYSICS_FRAME_BUDGET, max_substeps=c.MAX_SUBSTEPS):
+        self.sim = sim
+        self.budget = budget
+        self.max_substeps = max_substeps
+        self.costs = deque(maxlen=c.QUALITY_WINDOW)  # Seconds spent stepping in recent frames
+        self.cooldown = 0.0
+
+    @property
+    def tier_name(self):
+        return c.QUALITY_TIERS[self.sim.quality]["name"]
+
+    def update(self, delta_time):
+        """Step the simulation for one frame; returns the number of physics steps taken."""
+        start = time.perf_counter()
+        steps = self.sim.update(delta_time, self.max_substeps)
+        if steps:
+            self.costs.append(time.perf_counter() - start)
+
+        self.cooldown = max(0.0, self.cooldown - delta_time)
+        if self.cooldown == 0.0 and len(self.costs) == self.costs.maxlen:
+            self.adapt()
+        return steps
+
+    def average_cost(self):
+        return sum(self.costs) / len(self.costs) if self.costs else 0.0
+
+    def adapt(self):
+        """Move one tier down when over budget, one up when comfortably under it."""
+        cost = self.average_cost()
+        tier = self.sim.quality
+        if cost > self.budget and tier < len(c.QUALITY_TIERS) - 1:
+            self.set_tier(tier + 1, cost)
+        elif cost < self.budget * c.QUALITY_RECOVER_RATIO and tier > 0:
+            self.set_tier(tier - 1, cost)
+
+    def set_tier(self, tier, cost):
+        self.sim.set_quality(tier)
+        self.costs.clear()
+        self.cooldown = c.QUALITY_COOLDOWN
+        print(f"Physics quality: {self.tier_name} ({cost * 1000:.1f} ms of physics per frame)")
+
+    def stats(self):
+        """Current tier and load, for the profiler overlay."""
+        return {
+            'tier': self.tier_name,
+            'cost_ms': self.average_cost() * 1000,
+            'budget_ms': self.budget * 1000,
+            'dropped_steps': self.sim.dropped_steps,
+        }
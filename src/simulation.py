@@ -0,0 +1,764 @@
+# src/simulation.py
+import math
+import random
+
+import arcade
+import pymunk
+from src import constants as c
+from src import level_cache
+from src.damage import DamageModel
+from src.pool import SpritePool
+from src.profiler import profiler
+from src.projectiles import projectiles
+from src.spatial import SpatialIndex
+from src.assets import assets
+from src.entities import Banana, Debris, EnemyMonkey, BambooBlock, WoodBlock
+
+# Why a body is taken out of the world; only the first three break it (sound, debris)
+REMOVED_BROKEN = "broken"  # Damage used up its health
+REMOVED_EXPLODED = "exploded"
+REMOVED_HIT = "hit"  # A banana touched a monkey
+REMOVED_RETIRED = "retired"  # A banana at rest or a piece of debris past its lifetime
+REMOVED_OUT_OF_BOUNDS = "out_of_bounds"
+BREAK_REASONS = (REMOVED_BROKEN, REMOVED_EXPLODED, REMOVED_HIT)
+
+STATIC_BOX_RADIUS = 0.5  # Rounds the corners of baked boxes so bodies don't catch on seams
+
+
+def throw_impulse(start_pos, end_pos):
+    """Impulse applied to a banana for a drag from start_pos to end_pos."""
+    force_x = (start_pos[0] - end_pos[0]) * c.THROW_FORCE_MULTIPLIER
+    force_y = (start_pos[1] - end_pos[1]) * c.THROW_FORCE_MULTIPLIER
+    # A drag can end outside the window; never throw harder than one across it
+    strength = math.hypot(force_x, force_y)
+    if strength > c.MAX_THROW_IMPULSE:
+        force_x *= c.MAX_THROW_IMPULSE / strength
+        force_y *= c.MAX_THROW_IMPULSE / strength
+    return (force_x, force_y)
+
+
+def place_body(body, position, angle=0.0):
+    """Put a body at rest at `position`, as if it had just been created there."""
+    # No time passes, so this only clears the bias velocity the contact solver
+    # leaves on a body; a body taken out of a space mid-contact keeps it and
+    # would otherwise move on its first step back in
+    pymunk.Body.update_position(body, 0.0)
+    body.position = position
+    body.angle = angle
+    body.velocity = (0, 0)
+    body.angular_velocity = 0
+    body.force = (0, 0)
+    body.torque = 0
+
+
+def merge_rects(rects):
+    """
+    Join (x, y, w, h) rectangles that sit edge to edge in a row, then those
+    stacked in a column, so a tiled ground becomes a few long pieces.
+    """
+    merged = []
+    for x, y, w, h in sorted(rects, key=lambda r: (r[1], r[3], r[0])):
+        if merged:
+            px, py, pw, ph = merged[-1]
+            if py == y and ph == h and px <= x <= px + pw:
+                merged[-1] = (px, py, max(pw, x + w - px), ph)
+                continue
+        merged.append((x, y, w, h))
+
+    columns = []
+    for x, y, w, h in sorted(merged, key=lambda r: (r[0], r[2], r[1])):
+        if columns:
+            px, py, pw, ph = columns[-1]
+            if px == x and pw == w and py <= y <= py + ph:
+                columns[-1] = (px, py, pw, max(ph, y + h - py))
+                continue
+        columns.append((x, y, w, h))
+    return columns
+
+
+class Simulation:
+    """
+    The game world without a window: pymunk physics, break/kill rules and
+    the win condition. Physics always advances in fixed PHYSICS_DT steps.
+    """
+
+    def __init__(self, map_file=None, verbose=True, seed=0):
+        # --- Sprite Lists (lazy: no OpenGL context needed until drawn) ---
+        self.banana_list = arcade.SpriteList(lazy=True)
+        self.enemy_list = arcade.SpriteList(lazy=True)
+        self.bamboo_list = arcade.SpriteList(lazy=True)
+        self.wood_list = arcade.SpriteList(lazy=True)
+        self.debris_list = arcade.SpriteList(lazy=True)
+        # Baked backdrop and static blocks: drawn, but no dynamic bodies
+        self.terrain_list = arcade.SpriteList(lazy=True)
+
+        # --- Physics Engine ---
+        self.physics_engine = None
+        self.static_body = None
+        self.pending_removals = {}  # sprite -> why it is being removed (REMOVED_*)
+        self.pools = {}  # pool key -> SpritePool of retired bananas/debris and their bodies
+        self.damage = DamageModel()
+        self.spatial = SpatialIndex()
+
+        # --- Fixed timestep ---
+        self.dt = c.PHYSICS_DT
+        self.accumulator = 0.0
+        self.frame = 0
+        self.dropped_steps = 0  # Steps skipped because a frame ran out of substeps
+
+        # --- Quality tier (see scheduler.py); damage and culling run every N steps ---
+        self.quality = 0
+        self.quality_changes = []  # (frame, tier) per change, replayed like launches
+        self.damage_interval = 1
+        self.cull_interval = c.CULL_INTERVAL_STEPS
+        self.damage_steps = 0
+        self.cull_steps = 0
+        self.settling = True  # No damage until the level has settled, see step()
+
+        # --- Scoring ---
+        self.launch_count = 0
+        self.enemy_count = 0
+
+        # --- Banana effects still to fire (split/explode) ---
+        self.armed = []
+        self.split_groups = 0
+
+        # --- Replay record: (frame, impulse x, impulse y, banana type) per launch ---
+        # Any randomness in the world must come from self.random so a replay
+        # with the same seed reproduces it
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.launches = []
+
+        # --- Things the player should hear about: (name, x, y, strength), drained by the view ---
+        self.events = []
+
+        # --- Level data ---
+        self.map_file = map_file
+        self.level = None
+        self.snapshot = []
+        self.verbose = verbose
+
+        self.setup(map_file)
+
+    def setup(self, map_file=None):
+        """
+        Build the world for a level.
+
+        Args:
+            map_file: Optional path to a Tiled .tmx file
+        """
+
+        # 1. --- Build the Level ---
+        if map_file:
+            self.load_tilemap(map_file)
+        else:
+            self.build_default_level()
+
+        # 2. --- Scenery for the static blocks ---
+        self.add_static_sprites()
+
+        # 3. --- Put Everything into a Physics World ---
+        self.enemy_count = len(self.enemy_list)
+        self.build_physics()
+
+        # 4. --- Remember the starting state for reset() ---
+        self.take_snapshot()
+
+    def new_physics_engine(self):
+        """An empty physics world with the game's gravity, sleeping and solver settings."""
+        physics_engine = arcade.PymunkPhysicsEngine(
+            damping=c.DEFAULT_DAMPING,
+            gravity=c.GRAVITY
+        )
+        # Let settled stacks sleep so they cost nothing until something hits them
+        space = physics_engine.space
+        space.sleep_time_threshold = c.SLEEP_TIME_THRESHOLD
+        space.idle_speed_threshold = c.IDLE_SPEED_THRESHOLD
+        space.iterations = c.QUALITY_TIERS[self.quality]["iterations"]
+        return physics_engine
+
+    def build_physics(self):
+        """Create the physics world and a body for every level sprite."""
+
+        # 1. --- Initialize Physics Engine ---
+        self.physics_engine = self.new_physics_engine()
+
+        # 2. --- Bake the Static Geometry (or the plain ground) ---
+        self.bake_static_geometry()
+
+        # 3. --- Add Sprite Lists to Physics Engine ---
+        self.physics_engine.add_sprite_list(
+            self.enemy_list,
+            mass=c.ENEMY_MASS,
+            friction=c.ENEMY_FRICTION,
+            collision_type=c.ENEMY_COLLISION_TYPE
+        )
+        self.physics_engine.add_sprite_list(
+            self.bamboo_list,
+            mass=c.BAMBOO_MASS,
+            friction=c.BAMBOO_FRICTION,
+            collision_type=c.BAMBOO_COLLISION_TYPE
+        )
+        self.physics_engine.add_sprite_list(
+            self.wood_list,
+            mass=c.WOOD_MASS,
+            friction=c.WOOD_FRICTION,
+            collision_type=c.WOOD_COLLISION_TYPE
+        )
+        self.physics_engine.add_sprite_list(
+            self.banana_list,
+            mass=c.BANANA_MASS,
+            friction=c.BANANA_FRICTION,
+            collision_type=c.BANANA_COLLISION_TYPE
+        )
+
+        # 4. --- Handlers, damage and the spatial index ---
+        self.finish_physics()
+
+    def finish_physics(self):
+        """Hook a world whose bodies are all in place up to the game rules."""
+        # Block damage is gathered per step instead of through handlers
+        self.physics_engine.add_collision_handler(
+            c.BANANA_COLLISION_TYPE, c.ENEMY_COLLISION_TYPE,
+            post_handler=self.banana_hit_enemy
+        )
+
+        # Track damage and index every body for area queries
+        self.damage.build(self.physics_engine, self.level_sprites())
+        self.spatial = SpatialIndex()
+        self.spatial.update(self.physics_engine)
+
+    def load_tilemap(self, map_file):
+        """Build the level from the compiled object layers of a Tiled map."""
+        try:
+            self.level = level_cache.load_level(map_file)
+        except Exception as e:
+            print(f"Error loading tilemap: {e}")
+            print("Falling back to default level")
+            self.build_default_level()
+            return
+
+        # Object layers are named "Bamboo", "Wood" and "Monkeys" in Tiled;
+        # static records (the "Ground" layer too) are left to bake_static_geometry()
+        for kind, x, y, w, h in self.level.records(static=False):
+            if kind == level_cache.KIND_BAMBOO:
+                self.bamboo_list.append(BambooBlock((x + w / 2, y + h / 2)))
+            elif kind == level_cache.KIND_WOOD:
+                self.wood_list.append(WoodBlock((x + w / 2, y + h / 2)))
+            elif kind == level_cache.KIND_MONKEY:
+                enemy = EnemyMonkey(x=x + w / 2, y=y + h / 2, width=w, height=h)
+                self.enemy_list.append(enemy)
+
+        if self.verbose:
+            print(f"Loaded: {len(self.bamboo_list)} bamboo, {len(self.wood_list)} wood, {len(self.enemy_list)} enemies")
+
+    def build_default_level(self):
+        """Build a default programmatic level."""
+        tower_x = c.SCREEN_WIDTH - 200
+
+        # Base - mix of bamboo and wood
+        bamboo1 = BambooBlock((tower_x - 50, 60))
+        self.bamboo_list.append(bamboo1)
+
+        wood1 = WoodBlock((tower_x, 60))
+        self.wood_list.append(wood1)
+
+        bamboo2 = BambooBlock((tower_x + 50, 60))
+        self.bamboo_list.append(bamboo2)
+
+        # Enemy 1
+        enemy1 = EnemyMonkey(x=tower_x, y=100, width=32, height=32)
+        self.enemy_list.append(enemy1)
+
+        # Second floor
+        wood2 = WoodBlock((tower_x - 25, 140))
+        self.wood_list.append(wood2)
+
+        wood3 = WoodBlock((tower_x + 25, 140))
+        self.wood_list.append(wood3)
+
+        # Enemy 2
+        enemy2 = EnemyMonkey(x=tower_x, y=180, width=32, height=32)
+        self.enemy_list.append(enemy2)
+
+    def static_records(self):
+        return list(self.level.records(static=True)) if self.level else []
+
+    def add_static_sprites(self):
+        """Give static blocks a sprite in terrain_list; their bodies are baked by bake_static_geometry()."""
+        for kind, x, y, w, h in self.static_records():
+            if kind == level_cache.KIND_BAMBOO:
+                block = BambooBlock((x + w / 2, y + h / 2))
+            elif kind == level_cache.KIND_WOOD:
+                block = WoodBlock((x + w / 2, y + h / 2))
+            else:
+                continue
+            block.width = w
+            block.height = h
+            self.terrain_list.append(block)
+
+    def bake_static_geometry(self):
+        """
+        Turn the level's static records into one static pymunk body.
+
+        Each (merged) rectangle becomes a solid box on that single body, so
+        a fast body that gets inside one is pushed back out instead of being
+        trapped in a hollow outline. Levels without static records get the
+        plain ground.
+        """
+        static_records = self.static_records()
+        if not static_records:
+            ground = arcade.SpriteSolidColor(2000, 20, arcade.color.BURLYWOOD)
+            ground.position = (c.SCREEN_WIDTH / 2, 10)
+            self.physics_engine.add_sprite(
+                ground,
+                friction=1.0,
+                body_type=arcade.PymunkPhysicsEngine.STATIC
+            )
+            return
+
+        body = pymunk.Body(body_type=pymunk.Body.STATIC)
+        boxes = []
+        for x, y, w, h in merge_rects([(x, y, w, h) for _, x, y, w, h in static_records]):
+            box = pymunk.Poly.create_box_bb(body, pymunk.BB(x, y, x + w, y + h), STATIC_BOX_RADIUS)
+            box.friction = 1.0
+            boxes.append(box)
+        self.physics_engine.space.add(body, *boxes)
+        self.static_body = body
+
+    def add_backdrop(self, image_path):
+        """Draw a baked image of the level's tile art behind everything, bottom-left at the origin."""
+        backdrop = arcade.Sprite(assets.texture(image_path))
+        backdrop.position = (backdrop.width / 2, backdrop.height / 2)
+        self.terrain_list.insert(0, backdrop)
+
+    # --- Reset ---
+    def level_sprites(self):
+        """Every enemy and block sprite with a body, in world-building order."""
+        return [sprite for sprite_list in (self.enemy_list, self.bamboo_list, self.wood_list)
+                for sprite in sprite_list]
+
+    def take_snapshot(self):
+        """Record every level sprite's list, physics object and starting position, in world-building order."""
+        self.snapshot = []
+        for sprite_list in (self.enemy_list, self.bamboo_list, self.wood_list):
+            for sprite in sprite_list:
+                physics_object = self.physics_engine.get_physics_object(sprite)
+                self.snapshot.append((sprite, sprite_list, physics_object, tuple(sprite.position), sprite.angle))
+
+    def reset(self):
+        """
+        Put the level back to its starting state.
+
+        Nothing is reloaded and no body or shape is rebuilt: the level's
+        bodies and the static geometry move into a new, empty pymunk space,
+        in the order a freshly loaded Simulation adds them. The space itself
+        is the one thing not reused. Chipmunk numbers shapes and sizes its
+        internal tables by everything the space has ever held, and that
+        decides the order contacts are solved in, so rewinding the old space
+        would let a restarted attempt drift from a fresh one (and from its
+        own replay).
+        """
+        for banana in list(self.banana_list):
+            self.remove(banana)
+        for debris in list(self.debris_list):
+            self.remove(debris)
+        self.pending_removals.clear()
+        self.armed.clear()
+
+        # Take the level sprites out of the old world; the static geometry is all that's left
+        for sprite in self.level_sprites():
+            sprite.remove_from_sprite_lists()
+        old_engine = self.physics_engine
+        bodies = old_engine.space.bodies
+        shapes = old_engine.space.shapes
+        old_engine.space.remove(*shapes, *bodies)
+
+        self.physics_engine = self.new_physics_engine()
+        self.physics_engine.space.add(*bodies, *shapes)
+        self.physics_engine.sprites.update(old_engine.sprites)
+        # Pooled bananas and debris keep the collision type numbers of the old world
+        self.physics_engine.collision_types = old_engine.collision_types
+
+        # Level bodies go back in their original order and place
+        for sprite, sprite_list, physics_object, position, angle in self.snapshot:
+            sprite.position = position
+            sprite.angle = angle
+            place_body(physics_object.body, position, math.radians(angle))
+            self.attach(sprite, sprite_list, physics_object)
+        self.finish_physics()
+
+        self.accumulator = 0.0
+        self.frame = 0
+        self.damage_steps = 0
+        self.cull_steps = 0
+        self.settling = True
+        self.launch_count = 0
+        self.split_groups = 0
+        self.launches.clear()
+        self.events.clear()
+        # The tier carries over; a replay of the new attempt starts at it
+        self.quality_changes.clear()
+        if self.quality:
+            self.quality_changes.append((0, self.quality))
+        self.random.seed(self.seed)
+
+    def attach(self, sprite, sprite_list, physics_object):
+        """Put a removed sprite back into its list and the physics world with its old body."""
+        sprite_list.append(sprite)
+        self.physics_engine.space.add(physics_object.body, physics_object.shape)
+        self.physics_engine.sprites[sprite] = physics_object
+        self.physics_engine.non_static_sprite_list.append(sprite)
+        sprite.register_physics_engine(self.physics_engine)
+
+    # --- Stepping ---
+    def update(self, delta_time, max_steps=c.MAX_SUBSTEPS):
+        """
+        Advance by a variable frame time, running as many fixed steps as fit.
+
+        At most max_steps are run; time beyond that is dropped (the game
+        slows down) rather than piling up for the next frame. Returns the
+        number of physics steps taken.
+        """
+        # Never try to catch up more than MAX_FRAME_TIME in one go
+        self.accumulator += min(delta_time, c.MAX_FRAME_TIME)
+        steps = 0
+        while self.accumulator >= self.dt and steps < max_steps:
+            self.step()
+            self.accumulator -= self.dt
+            steps += 1
+        if self.accumulator >= self.dt:
+            dropped = int(self.accumulator / self.dt)
+            self.dropped_steps += dropped
+            self.accumulator -= dropped * self.dt
+        return steps
+
+    def set_quality(self, tier):
+        """Switch to a tier of c.QUALITY_TIERS (0 is full quality), recording the change for replays."""
+        settings = c.QUALITY_TIERS[tier]
+        self.physics_engine.space.iterations = settings["iterations"]
+        self.damage_interval = settings["damage_interval"]
+        self.cull_interval = settings["cull_interval"]
+        if tier != self.quality:
+            self.quality = tier
+            self.quality_changes.append((self.frame, tier))
+
+    def step(self):
+        """Advance the world by exactly one fixed timestep."""
+        with profiler.section("physics_engine.step"):
+            self.physics_engine.step(self.dt)
+        self.spatial.update(self.physics_engine)
+        self.damage_steps += 1
+        if self.damage_steps >= self.damage_interval:
+            with profiler.section("damage"):
+                for sprite in self.damage.update(not self.settling, self.damage_steps):
+                    if isinstance(sprite, BambooBlock):
+                        self.slow_bananas_through(sprite)
+                    self.queue_removal(sprite, REMOVED_BROKEN)
+            self.damage_steps = 0
+            if self.settling and (self.damage.awake == 0 or self.elapsed >= c.DAMAGE_GRACE_TIME):
+                self.settling = False
+        self.frame += 1
+        self.cull_steps += 1
+        if self.cull_steps >= self.cull_interval:
+            with profiler.section("cull_bodies"):
+                self.cull_bodies(self.dt * self.cull_steps)
+            self.cull_steps = 0
+        with profiler.section("check_collisions"):
+            self.check_collisions()
+        if self.armed:
+            self.trigger_effects()
+
+    def cull_bodies(self, elapsed):
+        """
+        Queue removal of bananas that have come to rest and of anything that
+        has left the world bounds.
+        """
+        for debris in self.debris_list:
+            debris.age += elapsed
+            if debris.age >= c.DEBRIS_LIFETIME:
+                self.queue_removal(debris, REMOVED_RETIRED)
+
+        for banana in self.banana_list:
+            body = self.physics_engine.get_physics_object(banana).body
+            if body.is_sleeping or body.velocity.length < c.BANANA_REST_SPEED:
+                banana.rest_time += elapsed
+                if banana.rest_time >= c.BANANA_REST_TIME:
+                    self.queue_removal(banana, REMOVED_RETIRED)
+            else:
+                banana.rest_time = 0.0
+
+        for sprite in self.physics_engine.non_static_sprite_list:
+            x, y = self.physics_engine.get_physics_object(sprite).body.position
+            if x < c.WORLD_LEFT or x > c.WORLD_RIGHT or y < c.WORLD_BOTTOM:
+                self.queue_removal(sprite, REMOVED_OUT_OF_BOUNDS)
+
+    def body_counts(self):
+        """Return (active, sleeping) counts of the dynamic bodies in the world."""
+        sleeping = 0
+        total = 0
+        for sprite in self.physics_engine.non_static_sprite_list:
+            total += 1
+            if self.physics_engine.get_physics_object(sprite).body.is_sleeping:
+                sleeping += 1
+        return total - sleeping, sleeping
+
+    def can_launch(self):
+        """False while the level settles and until LAUNCH_COOLDOWN_STEPS have passed since the last throw."""
+        if self.settling:
+            return False
+        return not self.launches or self.frame - self.launches[-1][0] >= c.LAUNCH_COOLDOWN_STEPS
+
+    def launch(self, force, projectile="normal"):
+        """Launch a new banana of the given type from the player with the given impulse."""
+        banana = self.spawn_banana(projectiles.get(projectile), c.BANANA_START_POS)
+        self.physics_engine.apply_impulse(banana, force)
+        self.launch_count += 1
+        self.launches.append((self.frame, float(force[0]), float(force[1]), projectile))
+        self.events.append(("launch", banana.center_x, banana.center_y, math.hypot(force[0], force[1])))
+        return banana
+
+    def spawn_banana(self, kind, position, velocity=None):
+        """Put a banana of type `kind` into the world, optionally already moving."""
+        # Keep the number of live projectiles bounded
+        while len(self.banana_list) >= c.MAX_LIVE_BANANAS:
+            self.remove(self.banana_list[0])
+
+        banana = self.take_from_pool(
+            self.pool(kind.name, lambda: Banana(kind)), self.banana_list, position, velocity,
+            mass=kind.mass,
+            friction=kind.friction,
+            damping=kind.damping,
+            collision_type=c.BANANA_COLLISION_TYPE
+        )
+        # A reused banana may still carry the filter group of an earlier split
+        self.physics_engine.get_physics_object(banana).shape.filter = pymunk.ShapeFilter()
+        banana.rest_time = 0.0
+        banana.armed = kind.effect is not None
+        if banana.armed:
+            self.armed.append(banana)
+        return banana
+
+    def spawn_debris(self, material, position):
+        """Throw a few pieces of a broken block out from where it was."""
+        rng = self.random
+        for _ in range(c.DEBRIS_PIECES):
+            while len(self.debris_list) >= c.MAX_LIVE_DEBRIS:
+                self.remove(self.debris_list[0])
+            angle = rng.uniform(0.0, math.pi)
+            speed = c.DEBRIS_SPEED * rng.uniform(0.5, 1.0)
+            debris = self.take_from_pool(
+                self.pool("debris:" + material, lambda: Debris(material)), self.debris_list,
+                position, (math.cos(angle) * speed, math.sin(angle) * speed),
+                mass=c.DEBRIS_MASS,
+                collision_type=c.DEBRIS_COLLISION_TYPE
+            )
+            debris.age = 0.0
+            physics_object = self.physics_engine.get_physics_object(debris)
+            physics_object.body.angular_velocity = rng.uniform(-10.0, 10.0)
+            physics_object.shape.filter = pymunk.ShapeFilter(mask=0)  # Purely visual: touches nothing
+
+    def pool(self, key, factory):
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = SpritePool(factory)
+        return pool
+
+    def take_from_pool(self, pool, sprite_list, position, velocity=None, **physics):
+        """
+        Put a pooled sprite into the world at `position`.
+
+        A reused sprite gets its old body and shape back with their motion
+        cleared; only a brand new one goes through add_sprite().
+        """
+        sprite, physics_object = pool.acquire()
+        sprite.pool = pool
+        sprite.position = position
+        sprite.angle = 0
+        if physics_object is None:
+            sprite_list.append(sprite)
+            self.physics_engine.add_sprite(sprite, **physics)
+            body = self.physics_engine.get_physics_object(sprite).body
+        else:
+            body = physics_object.body
+            place_body(body, position)
+            self.attach(sprite, sprite_list, physics_object)
+        if velocity is not None:
+            body.velocity = velocity
+        return sprite
+
+    def prefill(self):
+        """Allocate the first bananas and debris up front so the first shots and breaks don't."""
+        # Straight through the pools, so the seeded random stream is left untouched
+        origin = (c.WORLD_LEFT, c.WORLD_BOTTOM)
+        kind = projectiles.get(projectiles.names[0])
+        for _ in range(c.MAX_LIVE_BANANAS):
+            self.take_from_pool(
+                self.pool(kind.name, lambda: Banana(kind)), self.banana_list, origin,
+                mass=kind.mass, friction=kind.friction, damping=kind.damping,
+                collision_type=c.BANANA_COLLISION_TYPE
+            )
+        for material in ("bamboo", "wood"):
+            for _ in range(c.DEBRIS_PREFILL):
+                self.take_from_pool(
+                    self.pool("debris:" + material, lambda: Debris(material)), self.debris_list, origin,
+                    mass=c.DEBRIS_MASS, collision_type=c.DEBRIS_COLLISION_TYPE
+                )
+        for sprite in list(self.banana_list) + list(self.debris_list):
+            self.remove(sprite)
+
+    def pooled_sprites(self):
+        """Every sprite waiting in a pool."""
+        return [sprite for pool in self.pools.values() for sprite, _ in pool.free]
+
+    def remove(self, sprite):
+        """
+        Take a sprite out of its lists, the physics world and the spatial index
+        now. Pooled sprites go back to their pool along with their body.
+        """
+        physics_object = self.physics_engine.sprites.get(sprite)
+        self.spatial.remove(sprite)
+        self.damage.forget(sprite)
+        if getattr(sprite, "armed", False):
+            sprite.armed = False
+            self.armed.remove(sprite)
+        sprite.remove_from_sprite_lists()
+        pool = getattr(sprite, "pool", None)
+        if pool is not None and physics_object is not None:
+            pool.release(sprite, physics_object)
+
+    # --- Banana effects ---
+    def trigger_effects(self):
+        """Fire the split/explode effect of every armed banana whose trigger was met."""
+        for banana in list(self.armed):
+            if banana not in self.physics_engine.sprites:
+                self.armed.remove(banana)  # Retired before its effect fired
+                continue
+            body = self.physics_engine.get_physics_object(banana).body
+            if banana.kind.trigger == "apex":
+                fired = body.velocity.y < 0
+            else:
+                contacts = []
+                body.each_arbiter(contacts.append)
+                fired = bool(contacts)
+            if not fired:
+                continue
+            banana.armed = False
+            self.armed.remove(banana)
+            if banana.kind.effect == "split":
+                self.split(banana, body)
+            elif banana.kind.effect == "explode":
+                self.explode(banana, body)
+
+    def split(self, banana, body):
+        """Replace a banana with several fanned out around its direction of travel."""
+        kind = banana.kind
+        position = tuple(body.position)
+        velocity = body.velocity
+        self.remove(banana)
+
+        # Pieces of one split pass through each other instead of shoving apart
+        self.split_groups += 1
+        shape_filter = pymunk.ShapeFilter(group=self.split_groups)
+        middle = (kind.split_count - 1) / 2
+        for i in range(kind.split_count):
+            angle = math.radians(kind.split_spread * (i - middle))
+            piece = self.spawn_banana(projectiles.get(kind.split_into), position, velocity.rotated(angle))
+            self.physics_engine.get_physics_object(piece).shape.filter = shape_filter
+
+    def explode(self, banana, body):
+        """Push everything within the blast radius away, breaking bamboo and monkeys in it."""
+        kind = banana.kind
+        center = body.position
+        self.remove(banana)
+
+        for sprite in self.sprites_near(center.x, center.y, kind.explode_radius):
+            if isinstance(sprite, Banana):
+                continue
+            target = self.physics_engine.get_physics_object(sprite).body
+            offset = target.position - center
+            distance = offset.length
+            falloff = max(0.0, 1.0 - distance / kind.explode_radius)
+            direction = offset.normalized() if distance > 0 else pymunk.Vec2d(0, 1)
+            target.activate()
+            target.apply_impulse_at_world_point(direction * kind.explode_impulse * falloff, target.position)
+            if isinstance(sprite, (BambooBlock, EnemyMonkey)):
+                self.queue_removal(sprite, REMOVED_EXPLODED)
+
+    def sprite_lists(self):
+        """Every sprite list the world owns, in draw order."""
+        return [sprite_list for _, sprite_list in self.named_sprite_lists()]
+
+    def named_sprite_lists(self):
+        """(name, sprite list) pairs in draw order."""
+        return [
+            ("terrain_list", self.terrain_list),
+            ("bamboo_list", self.bamboo_list),
+            ("wood_list", self.wood_list),
+            ("enemy_list", self.enemy_list),
+            ("banana_list", self.banana_list),
+            ("debris_list", self.debris_list),
+        ]
+
+    def sprites_at(self, x, y):
+        """Physics sprites whose bounds contain a point, e.g. under the mouse."""
+        return self.spatial.query_point(x, y)
+
+    def sprites_near(self, x, y, radius):
+        """Physics sprites within `radius` of a point, e.g. caught in a blast."""
+        return self.spatial.query_radius(x, y, radius)
+
+    @property
+    def elapsed(self):
+        """Simulated seconds since the level started."""
+        return self.frame * self.dt
+
+    def score(self):
+        """Points for monkeys defeated, plus a bonus for every banana left unused."""
+        defeated = self.enemy_count - len(self.enemy_list)
+        spare = max(0, c.SCORE_BANANA_BUDGET - self.launch_count)
+        return defeated * c.SCORE_PER_ENEMY + spare * c.SCORE_PER_SPARE_BANANA
+
+    @property
+    def is_cleared(self):
+        """True when every enemy has been defeated."""
+        return len(self.enemy_list) == 0
+
+    # --- Collisions ---
+    def check_collisions(self):
+        """
+        Apply the removals queued during the step by collision handlers, damage
+        and culling. Blocks and monkeys that were broken (not just culled) throw
+        debris and are added to self.events.
+        """
+        for sprite, reason in self.pending_removals.items():
+            if (reason in BREAK_REASONS and isinstance(sprite, (BambooBlock, WoodBlock, EnemyMonkey))
+                    and sprite in self.physics_engine.sprites):
+                speed = self.physics_engine.get_physics_object(sprite).body.velocity.length
+                self.events.append((sprite.material, sprite.center_x, sprite.center_y, speed))
+                if not isinstance(sprite, EnemyMonkey):
+                    self.spawn_debris(sprite.material, sprite.position)
+            self.remove(sprite)
+        self.pending_removals.clear()
+
+    def queue_removal(self, sprite, reason):
+        """Remove a sprite once the physics step is over (pymunk forbids it mid-step)."""
+        # Breaking wins over a plain cull queued in the same step
+        if reason in BREAK_REASONS or sprite not in self.pending_removals:
+            self.pending_removals[sprite] = reason
+
+    def slow_bananas_through(self, bamboo):
+        """Bananas touching a bamboo block as it breaks lose speed going through it."""
+        banana_type = self.physics_engine.collision_types.index(c.BANANA_COLLISION_TYPE)
+        contacts = []
+        self.physics_engine.get_physics_object(bamboo).body.each_arbiter(contacts.append)
+        for arbiter in contacts:
+            other = arbiter.shapes[1]  # shapes[0] is the bamboo's own
+            if other.collision_type == banana_type:
+                other.body.velocity = other.body.velocity * c.BAMBOO_BREAK_SLOWDOWN
+
+    # --- Collision Handlers (run by pymunk after solving each contact) ---
+    def banana_hit_enemy(self, banana, enemy, arbiter, space, data):
+        """Enemy disappears when a banana touches it."""
+        self.queue_removal(enemy, REMOVED_HIT)
@@ -0,0 +1,240 @@
+# src/solver.py
+"""
+Batch shot solver for level validation and difficulty scoring.
+
+Sweeps a grid of launch angles and drag powers for each level, simulating
+every shot headlessly across a process pool. Usage:
+
+    python -m src.solver [level.tmx ...] [--workers N] [--max-bananas N]
+
+Results are appended to one JSON-lines file per level in the output
+directory as they finish, so an interrupted sweep resumes where it stopped.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from src import level_cache
+
+LEVELS_DIR = "assets/levels"
+RESULTS_DIR = "solver_results"
+SHOT_SECONDS = 6.0  # Simulated time given to each banana before the next one
+
+
+def rules_hash():
+    """
+    Hash of every game constant and the banana types.
+
+    Shot outcomes depend on physics, damage and scoring settings as much as
+    on the level, so results are keyed on both (c.RULES_VERSION covers code
+    changes that move outcomes without touching a constant).
+    """
+    from src import constants as c
+    from src.projectiles import PROJECTILES_FILE
+    rules = sorted((name, repr(value)) for name, value in vars(c).items() if name.isupper())
+    digest = hashlib.sha1(repr(rules).encode("utf-8"))
+    digest.update(level_cache.file_hash(PROJECTILES_FILE))
+    return digest.digest()
+
+
+def level_hash(level_file):
+    """Hash of a level file together with the rules, so stale results are never reused."""
+    return hashlib.sha1(level_cache.file_hash(level_file) + rules_hash()).hexdigest()
+
+
+def shot_impulse(angle, power):
+    """Impulse for a drag of `power` pixels pulled back at `angle` degrees."""
+    from src.simulation import throw_impulse
+    rad = math.radians(angle)
+    end = (-power * math.cos(rad), -power * math.sin(rad))
+    return throw_impulse((0, 0), end)
+
+
+def simulate_shots(level_file, shots):
+    """
+    Play a sequence of (angle, power) shots on a fresh world.
+
+    Returns the number of enemies left standing afterwards.
+    """
+    from src.simulation import Simulation
+    sim = Simulation(level_file, verbose=False)
+    # A player can't throw until the level has settled (see Simulation.can_launch)
+    while sim.settling:
+        sim.step()
+    steps_per_shot = int(SHOT_SECONDS / sim.dt)
+    for angle, power in shots:
+        sim.launch(shot_impulse(angle, power))
+        for _ in range(steps_per_shot):
+            sim.step()
+            if sim.is_cleared:
+                return 0
+    return len(sim.enemy_list)
+
+
+def _run_task(task):
+    """Process-pool entry point: task is (level_file, prefix, angle, power)."""
+    level_file, prefix, angle, power = task
+    remaining = simulate_shots(level_file, prefix + [(angle, power)])
+    return angle, power, remaining
+
+
+def shot_grid(angle_min, angle_max, angle_step, power_min, power_max, power_step):
+    """All (angle, power) pairs of the sweep, in a fixed order."""
+    grid = []
+    angle = angle_min
+    while angle <= angle_max:
+        power = power_min
+        while power <= power_max:
+            grid.append((angle, power))
+            power += power_step
+        angle += angle_step
+    return grid
+
+
+class LevelSweep:
+    """Greedy multi-banana sweep of one level, backed by a resumable results file."""
+
+    def __init__(self, level_file, grid, workers, results_dir=RESULTS_DIR):
+        self.level_file = level_file
+        self.grid = grid
+        self.workers = workers
+        self.hash = level_hash(level_file)
+        name = os.path.splitext(os.path.basename(level_file))[0]
+        self.results_file = os.path.join(results_dir, f"{name}.jsonl")
+        self.results = {}
+        self.load_results()
+
+    def load_results(self):
+        """Read back results of an earlier run of this exact level file."""
+        if not os.path.exists(self.results_file):
+            return
+        with open(self.results_file, 'r') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Half-written last line from an interrupted run
+                if row.get('hash') != self.hash:
+                    continue
+                key = self.key(row['prefix'], row['angle'], row['power'])
+                self.results[key] = row['remaining']
+
+    @staticmethod
+    def key(prefix, angle, power):
+        return (tuple(tuple(shot) for shot in prefix), angle, power)
+
+    def sweep_round(self, executor, prefix):
+        """Simulate every grid shot after `prefix`; returns {(angle, power): remaining}."""
+        todo = [(self.level_file, prefix, angle, power)
+                for angle, power in self.grid
+                if self.key(prefix, angle, power) not in self.results]
+
+        if todo:
+            os.makedirs(os.path.dirname(self.results_file) or ".", exist_ok=True)
+            with open(self.results_file, 'a') as f:
+                chunksize = max(1, len(todo) // (4 * self.workers))
+                for angle, power, remaining in executor.map(_run_task, todo, chunksize=chunksize):
+                    self.results[self.key(prefix, angle, power)] = remaining
+                    f.write(json.dumps({
+                        'hash': self.hash, 'prefix': prefix,
+                        'angle': angle, 'power': power, 'remaining': remaining
+                    }) + "\n")
+                    f.flush()
+
+        return {(angle, power): self.results[self.key(prefix, angle, power)]
+                for angle, power in self.grid}
+
+    def solve(self, executor, max_bananas):
+        """Find the fewest bananas that clear the level, greedily extending the best shot."""
+        prefix = []
+        for bananas in range(1, max_bananas + 1):
+            outcomes = self.sweep_round(executor, prefix)
+            clearing = [shot for shot in self.grid if outcomes[shot] == 0]
+            if clearing:
+                clear_ratio = len(clearing) / len(self.grid)
+                return {
+                    'level': self.level_file,
+                    'solved': True,
+                    'min_bananas': bananas,
+                    'setup_shots': prefix,
+                    'clearing_shots': clearing,
+                    'clear_ratio': clear_ratio,
+                    'difficulty': difficulty_score(bananas, clear_ratio),
+                }
+            # Grid order breaks ties, which keeps the sweep deterministic
+            best = min(self.grid, key=lambda shot: outcomes[shot])
+            prefix = prefix + [list(best)]
+
+        return {
+            'level': self.level_file,
+            'solved': False,
+            'min_bananas': None,
+            'setup_shots': prefix,
+            'clearing_shots': [],
+            'clear_ratio': 0.0,
+            'difficulty': None,
+        }
+
+
+def difficulty_score(bananas, clear_ratio):
+    """
+    One banana per point, plus up to one more point the rarer the clearing shots are.
+    A level most shots clear with one banana scores close to 1.
+    """
+    return round(bananas + (1.0 - clear_ratio), 3)
+
+
+def find_levels(levels_dir=LEVELS_DIR):
+    """All .tmx files in the levels directory, in natural (level2 < level10) order."""
+    def natural_key(path):
+        return [int(part) if part.isdigit() else part
+                for part in re.split(r'(\d+)', os.path.basename(path))]
+    return sorted(glob.glob(os.path.join(levels_dir, "*.tmx")), key=natural_key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep launch shots to validate and score levels.")
+    parser.add_argument("levels", nargs="*", help="Level files (default: every .tmx in assets/levels)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-bananas", type=int, default=3)
+    parser.add_argument("--angle-min", type=int, default=5)
+    parser.add_argument("--angle-max", type=int, default=85)
+    parser.add_argument("--angle-step", type=int, default=5)
+    parser.add_argument("--power-min", type=int, default=50)
+    parser.add_argument("--power-max", type=int, default=400)
+    parser.add_argument("--power-step", type=int, default=25)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    parser.add_argument("--json", dest="json_out", help="Write the per-level report to this file")
+    args = parser.parse_args(argv)
+
+    levels = args.levels or find_levels()
+    grid = shot_grid(args.angle_min, args.angle_max, args.angle_step,
+                     args.power_min, args.power_max, args.power_step)
+    print(f"Sweeping {len(grid)} shots per round over {len(levels)} level(s)")
+
+    workers = args.workers or os.cpu_count() or 1
+    report = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for level_file in levels:
+            sweep = LevelSweep(level_file, grid, workers, results_dir=args.results_dir)
+            summary = sweep.solve(executor, args.max_bananas)
+            report.append(summary)
+            if summary['solved']:
+                print(f"{level_file}: {summary['min_bananas']} banana(s), "
+                      f"{len(summary['clearing_shots'])} clearing shot(s), "
+                      f"difficulty {summary['difficulty']}")
+            else:
+                print(f"{level_file}: not cleared within {args.max_bananas} banana(s)")
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
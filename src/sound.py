@@ -0,0 +1,120 @@
+# src/sound.py
+"""
+Sound effects.
+
+Every effect in c.SFX_EFFECTS is decoded to PCM once (the asset preload
+does it off the main thread) and played through a fixed set of pyglet
+players, so a tower collapsing doesn't make a new player per falling block.
+Each effect plays at most once per "min_interval"; when every voice is busy
+a new sound takes over the one with the lowest priority, if it is no more
+important than the new one, and is dropped otherwise. Volume follows the
+strength of the event (impact speed, or the impulse of a launch).
+"""
+import time
+
+import pyglet
+
+from src import constants as c
+from src.assets import assets
+
+
+class SoundMixer:
+    """A fixed pool of voices shared by every sound effect."""
+
+    def __init__(self, voices=c.SFX_VOICES):
+        self.voice_count = voices
+        self.voices = []  # pyglet Players, made by load()
+        self.priority = []  # Per voice: priority of what it is playing
+        self.started = []  # Per voice: when it started
+        self.ends = []  # Per voice: when it will be free again
+        self.sources = {}  # event name -> decoded pyglet source
+        self.last_played = {}  # event name -> when it last started
+        self.loaded = False
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    def load(self):
+        """Decode the effects (if the preload hasn't already) and make the voices."""
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            for name, effect in c.SFX_EFFECTS.items():
+                self.sources[name] = assets.sound(effect["file"]).source
+            self.voices = [pyglet.media.Player() for _ in range(self.voice_count)]
+        except Exception as e:
+            print(f"Warning: sound effects disabled ({e})")
+            self.sources = {}
+            self.voices = []
+        self.priority = [0] * len(self.voices)
+        self.started = [0.0] * len(self.voices)
+        self.ends = [0.0] * len(self.voices)
+
+    def play_events(self, events):
+        """Play a frame's (name, x, y, strength) events, strongest first, so they win the voices."""
+        for name, _, _, strength in sorted(events, key=lambda event: -event[3]):
+            self.play(name, strength)
+
+    def play(self, name, strength=None):
+        """Play an effect; returns False if it was rate limited or no voice could take it."""
+        effect = c.SFX_EFFECTS.get(name)
+        source = self.sources.get(name)
+        if effect is None or source is None:
+            return False
+        now = time.perf_counter()
+        if now - self.last_played.get(name, float("-inf")) < effect["min_interval"]:
+            self.dropped += 1
+            return False
+
+        voice = self.pick_voice(effect["priority"], now)
+        if voice is None:
+            self.dropped += 1
+            return False
+
+        volume = 1.0
+        if strength is not None:
+            volume = max(c.SFX_MIN_VOLUME, min(1.0, strength / effect["full_volume"]))
+        player = self.voices[voice]
+        if player.source is not None:
+            player.next_source()  # Cut off whatever the voice was still playing
+        player.queue(source)
+        player.volume = volume * c.SFX_VOLUME
+        player.play()
+
+        self.priority[voice] = effect["priority"]
+        self.started[voice] = now
+        self.ends[voice] = now + (source.duration or 0.0)
+        self.last_played[name] = now
+        self.played += 1
+        return True
+
+    def pick_voice(self, priority, now):
+        """A free voice, else the oldest of the least important ones if it can be stolen, else None."""
+        victim = None
+        for voice, end in enumerate(self.ends):
+            if end <= now:
+                return voice
+            if victim is None or (self.priority[voice], self.started[voice]) < (
+                    self.priority[victim], self.started[victim]):
+                victim = voice
+        if victim is None or self.priority[victim] > priority:
+            return None
+        self.stolen += 1
+        return victim
+
+    def stop_all(self):
+        for voice, player in enumerate(self.voices):
+            player.pause()
+            if player.source is not None:
+                player.next_source()
+            self.ends[voice] = 0.0
+
+    def stats(self):
+        busy = sum(1 for end in self.ends if end > time.perf_counter())
+        return {'voices': len(self.voices), 'busy': busy,
+                'played': self.played, 'dropped': self.dropped, 'stolen': self.stolen}
+
+
+# Global sound effect mixer instance
+sfx = SoundMixer()
@@ -0,0 +1,152 @@
+# src/spatial.py
+"""
+Uniform-grid spatial hash over the physics sprites.
+
+Each sprite is filed under every grid cell its pymunk bounding box touches.
+After a physics step only awake bodies are looked at, and a sprite is only
+re-filed when its box has crossed into a different set of cells, so a
+settled level costs next to nothing to keep indexed.
+"""
+import math
+import time
+
+from src import constants as c
+from src.profiler import profiler
+
+
+class SpatialIndex:
+    """Point, box and radius queries over the dynamic sprites of a physics engine."""
+
+    def __init__(self, cell_size=c.SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> set of sprites
+        self.sprite_cells = {}  # sprite -> (cx0, cy0, cx1, cy1) it is filed under
+        self.boxes = {}  # sprite -> (left, bottom, right, top) when last filed
+        # --- Stats ---
+        self.checked = 0
+        self.moved = 0
+        self.queries = 0
+        self.candidates = 0
+        self.update_time = 0.0
+
+    def cell_range(self, left, bottom, right, top):
+        size = self.cell_size
+        return (math.floor(left / size), math.floor(bottom / size),
+                math.floor(right / size), math.floor(top / size))
+
+    def insert(self, sprite, box):
+        cell_range = self.cell_range(*box)
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = set()
+                bucket.add(sprite)
+        self.sprite_cells[sprite] = cell_range
+        self.boxes[sprite] = box
+
+    def remove(self, sprite):
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+        del self.boxes[sprite]
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(sprite)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
+
+    def update(self, physics_engine):
+        """Re-file the sprites whose awake bodies moved into different cells."""
+        start = time.perf_counter()
+        with profiler.section("spatial.update"):
+            checked = 0
+            moved = 0
+            sprite_cells = self.sprite_cells
+            for sprite in physics_engine.non_static_sprite_list:
+                shape = physics_engine.sprites[sprite].shape
+                known = sprite in sprite_cells
+                if known and shape.body.is_sleeping:
+                    continue
+                checked += 1
+                bb = shape.bb
+                box = (bb.left, bb.bottom, bb.right, bb.top)
+                if known:
+                    self.boxes[sprite] = box
+                    if self.cell_range(*box) == sprite_cells[sprite]:
+                        continue
+                    self.remove(sprite)
+                self.insert(sprite, box)
+                moved += 1
+        self.checked += checked
+        self.moved += moved
+        self.update_time += time.perf_counter() - start
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+        self.boxes.clear()
+
+    # --- Queries ---
+    def _candidates(self, left, bottom, right, top):
+        self.queries += 1
+        found = set()
+        cx0, cy0, cx1, cy1 = self.cell_range(left, bottom, right, top)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        self.candidates += len(found)
+        return found
+
+    def query_aabb(self, left, bottom, right, top):
+        """Sprites whose bounding box overlaps the given box."""
+        boxes = self.boxes
+        result = []
+        for sprite in self._candidates(left, bottom, right, top):
+            b_left, b_bottom, b_right, b_top = boxes[sprite]
+            if b_left <= right and b_right >= left and b_bottom <= top and b_top >= bottom:
+                result.append(sprite)
+        return result
+
+    def query_point(self, x, y):
+        """Sprites whose bounding box contains the point (e.g. under the mouse)."""
+        return self.query_aabb(x, y, x, y)
+
+    def query_radius(self, x, y, radius):
+        """Sprites whose bounding box comes within `radius` of the point (e.g. a blast)."""
+        boxes = self.boxes
+        result = []
+        radius_sq = radius * radius
+        for sprite in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            b_left, b_bottom, b_right, b_top = boxes[sprite]
+            dx = max(b_left - x, 0.0, x - b_right)
+            dy = max(b_bottom - y, 0.0, y - b_top)
+            if dx * dx + dy * dy <= radius_sq:
+                result.append(sprite)
+        return result
+
+    def stats(self):
+        """Counters since the last reset_stats(), for the profiler overlay."""
+        return {
+            "indexed": len(self.sprite_cells),
+            "cells": len(self.cells),
+            "checked": self.checked,
+            "moved": self.moved,
+            "queries": self.queries,
+            "candidates": self.candidates,
+            "update_ms": self.update_time * 1000,
+        }
+
+    def reset_stats(self):
+        self.checked = 0
+        self.moved = 0
+        self.queries = 0
+        self.candidates = 0
+        self.update_time = 0.0
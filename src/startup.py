@@ -0,0 +1,60 @@
+# src/startup.py
+"""
+Cold start timing and deferred startup work.
+
+main.py marks each stage of startup (imports, window, first menu frame) and
+--startup-profile prints how long each took. Anything the first menu frame
+doesn't need is queued with after_first_frame() and runs once that frame
+has been drawn.
+"""
+import time
+
+
+class StartupProfile:
+    """Stage timings from process start to the first menu frame."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.stages = []  # (stage name, seconds)
+        self.enabled = False
+        self.deferred = []
+        self.first_frame_drawn = False
+
+    def begin(self, start):
+        """Count from `start` (a perf_counter() taken before any imports)."""
+        self.start = self.last = start
+
+    def mark(self, name):
+        """End the current stage."""
+        now = time.perf_counter()
+        self.stages.append((name, now - self.last))
+        self.last = now
+
+    def after_first_frame(self, callback):
+        """Run `callback` once the first menu frame is on screen (right away if it already is)."""
+        if self.first_frame_drawn:
+            callback()
+        else:
+            self.deferred.append(callback)
+
+    def first_frame(self):
+        """Called after the menu draws; runs the deferred work once."""
+        if self.first_frame_drawn:
+            return
+        self.first_frame_drawn = True
+        self.mark("first menu frame")
+        if self.enabled:
+            self.report()
+        callbacks, self.deferred = self.deferred, []
+        for callback in callbacks:
+            callback()
+
+    def report(self):
+        print(f"Startup: first frame after {(self.last - self.start) * 1000:.1f} ms")
+        for name, seconds in self.stages:
+            print(f"  {seconds * 1000:7.1f} ms  {name}")
+
+
+# Global startup profile instance
+startup = StartupProfile()
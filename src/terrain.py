@@ -0,0 +1,209 @@
+# src/terrain.py
+"""
+Baked level art.
+
+The tile layers of a .tmx that don't belong to an interactive object layer
+(the background and ground art) are composed once into a single image with
+PIL and cached beside the compiled level, keyed by the level hash. The game
+then draws the whole backdrop as one sprite instead of a sprite per tile.
+
+A tile layer is baked unless a sibling object layer is "Bamboo", "Wood" or
+"Monkeys" (that art belongs to bodies that move). A bool `bake` property on
+the layer in Tiled overrides this either way.
+"""
+import bisect
+import glob
+import os
+import xml.etree.ElementTree as ET
+
+from PIL import Image
+
+from src import level_cache
+
+INTERACTIVE_LAYERS = {"Bamboo", "Wood", "Monkeys"}
+BAKED_SUFFIX = ".tiles.png"
+
+# Tiled stores flips in the top bits of each gid
+FLIP_HORIZONTAL = 0x80000000
+FLIP_VERTICAL = 0x40000000
+FLIP_DIAGONAL = 0x20000000
+GID_MASK = 0x1FFFFFFF
+
+
+def baked_path(tmx_path, level_hash):
+    folder, name = os.path.split(tmx_path)
+    base = os.path.splitext(name)[0]
+    return os.path.join(folder, level_cache.CACHE_DIR_NAME, f"{base}.{level_hash[:12]}{BAKED_SUFFIX}")
+
+
+def layer_property(element, name):
+    for prop in element.iterfind("properties/property"):
+        if prop.get("name") == name:
+            return prop.get("value") == "true"
+    return None
+
+
+def bakeable_layers(element, offset_x=0.0, offset_y=0.0, opacity=1.0):
+    """Yield (layer element, offset x, offset y, opacity) for every tile layer to bake."""
+    interactive = any(
+        child.tag == "objectgroup" and child.get("name") in INTERACTIVE_LAYERS
+        for child in element
+    )
+    for child in element:
+        if child.tag not in ("group", "layer") or child.get("visible") == "0":
+            continue
+        child_x = offset_x + float(child.get("offsetx", 0))
+        child_y = offset_y + float(child.get("offsety", 0))
+        child_opacity = opacity * float(child.get("opacity", 1))
+        if child.tag == "group":
+            yield from bakeable_layers(child, child_x, child_y, child_opacity)
+            continue
+        bake = layer_property(child, "bake")
+        if bake is None:
+            bake = not interactive
+        if bake:
+            yield child, child_x, child_y, child_opacity
+
+
+class Tilesets:
+    """Looks up and crops the image of any gid in a map, caching each tile."""
+
+    def __init__(self, root, base_dir):
+        self.entries = []  # (firstgid, tileset element, folder its paths are relative to)
+        for tileset in root.iterfind("tileset"):
+            folder = base_dir
+            source = tileset.get("source")
+            firstgid = int(tileset.get("firstgid"))
+            if source:
+                path = os.path.join(base_dir, source)
+                folder = os.path.dirname(path)
+                tileset = ET.parse(path).getroot()
+            self.entries.append((firstgid, tileset, folder))
+        self.entries.sort(key=lambda entry: entry[0])
+        self.firstgids = [entry[0] for entry in self.entries]
+        self.sheets = {}  # image path -> PIL image
+        self.tiles = {}  # gid with flip bits -> PIL image
+
+    def sheet(self, path):
+        image = self.sheets.get(path)
+        if image is None:
+            image = self.sheets[path] = Image.open(path).convert("RGBA")
+        return image
+
+    def tile(self, raw_gid):
+        image = self.tiles.get(raw_gid)
+        if image is not None:
+            return image
+
+        gid = raw_gid & GID_MASK
+        index = bisect.bisect_right(self.firstgids, gid) - 1
+        if index < 0:
+            return None
+        firstgid, tileset, folder = self.entries[index]
+        local_id = gid - firstgid
+
+        sheet_image = tileset.find("image")
+        if sheet_image is not None:
+            width = int(tileset.get("tilewidth"))
+            height = int(tileset.get("tileheight"))
+            columns = int(tileset.get("columns") or 1)
+            margin = int(tileset.get("margin", 0))
+            spacing = int(tileset.get("spacing", 0))
+            left = margin + (local_id % columns) * (width + spacing)
+            top = margin + (local_id // columns) * (height + spacing)
+            sheet = self.sheet(os.path.join(folder, sheet_image.get("source")))
+            image = sheet.crop((left, top, left + width, top + height))
+        else:
+            # Collection of images: each tile has its own file
+            image = None
+            for tile in tileset.iterfind("tile"):
+                if int(tile.get("id")) == local_id and tile.find("image") is not None:
+                    image = self.sheet(os.path.join(folder, tile.find("image").get("source")))
+                    break
+            if image is None:
+                return None
+
+        # Tiled applies the diagonal flip first, then horizontal, then vertical
+        if raw_gid & FLIP_DIAGONAL:
+            image = image.transpose(Image.Transpose.TRANSPOSE)
+        if raw_gid & FLIP_HORIZONTAL:
+            image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        if raw_gid & FLIP_VERTICAL:
+            image = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+        self.tiles[raw_gid] = image
+        return image
+
+
+def with_opacity(image, opacity):
+    if opacity >= 1.0:
+        return image
+    image = image.copy()
+    image.putalpha(image.getchannel("A").point(lambda alpha: int(alpha * opacity)))
+    return image
+
+
+def compose(tmx_path):
+    """Draw every bakeable tile layer into one image the size of the map, or None if there are none."""
+    root = ET.parse(tmx_path).getroot()
+    tile_width = int(root.get("tilewidth"))
+    tile_height = int(root.get("tileheight"))
+    canvas = Image.new("RGBA", (int(root.get("width")) * tile_width, int(root.get("height")) * tile_height))
+    tilesets = Tilesets(root, os.path.dirname(tmx_path))
+
+    drawn = 0
+    for layer, offset_x, offset_y, opacity in bakeable_layers(root):
+        data = layer.find("data")
+        if data is None or data.get("encoding") != "csv" or data.find("chunk") is not None:
+            print(f"Warning: {tmx_path} layer {layer.get('name')!r} is not CSV-encoded; not baked")
+            continue
+        columns = int(layer.get("width"))
+        for index, value in enumerate(data.text.replace("\n", "").split(",")):
+            raw_gid = int(value)
+            if raw_gid == 0:
+                continue
+            tile = tilesets.tile(raw_gid)
+            if tile is None:
+                continue
+            tile = with_opacity(tile, opacity)
+            # Tiles larger than the grid hang up and to the right from their cell's bottom-left
+            x = int((index % columns) * tile_width + offset_x)
+            y = int((index // columns + 1) * tile_height - tile.height + offset_y)
+            source = (max(0, -x), max(0, -y))
+            if source[0] >= tile.width or source[1] >= tile.height:
+                continue
+            canvas.alpha_composite(tile, dest=(max(0, x), max(0, y)), source=source)
+            drawn += 1
+    return canvas if drawn else None
+
+
+def bake_tile_layers(tmx_path, level_hash):
+    """
+    Path of the baked backdrop for a level, composing it first if needed.
+
+    Returns None when the level has no tile art to bake.
+    """
+    path = baked_path(tmx_path, level_hash)
+    if os.path.exists(path):
+        return path
+
+    image = compose(tmx_path)
+    if image is None:
+        return None
+    level_cache.atomic_write(path, lambda f: image.save(f, format="PNG"))
+
+    # Backdrops of older versions of this level are no longer needed
+    for stale in glob.glob(baked_path(tmx_path, "*")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass  # Another process baking this level got there first
+    return path
+
+
+def prepare(sim):
+    """Give a Simulation built from a map file its baked backdrop."""
+    if sim.map_file and sim.level:
+        path = bake_tile_layers(sim.map_file, sim.level.hash)
+        if path:
+            sim.add_backdrop(path)
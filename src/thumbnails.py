@@ -0,0 +1,144 @@
+# src/thumbnails.py
+"""
+Level preview thumbnails.
+
+Each level's compiled object layers are drawn into a small image with PIL (no
+window or level load needed) and every thumbnail is packed into one atlas
+image with a JSON index. Only thumbnails whose level hash changed are redrawn.
+Run `python -m src.thumbnails` to generate them ahead of time.
+"""
+import json
+import os
+
+from PIL import Image, ImageDraw
+
+from src import constants as c
+from src import level_cache
+from src.level_registry import registry
+
+ATLAS_NAME = "thumbnails.png"
+INDEX_NAME = "thumbnails.json"
+INDEX_VERSION = 2  # 2: Ground layer drawn
+
+SKY_COLOR = (173, 216, 230, 255)
+GROUND_COLOR = (139, 110, 60, 255)
+KIND_COLORS = {
+    level_cache.KIND_BAMBOO: (110, 170, 60, 255),
+    level_cache.KIND_WOOD: (150, 100, 50, 255),
+    level_cache.KIND_MONKEY: (120, 40, 30, 255),
+    level_cache.KIND_GROUND: GROUND_COLOR,
+}
+
+
+def render_thumbnail(level, width=c.THUMBNAIL_WIDTH, height=c.THUMBNAIL_HEIGHT):
+    """Draw a level's blocks and monkeys, scaled to fit, as a PIL image."""
+    # Fit the screen area plus anything placed beyond it
+    world_w = float(c.SCREEN_WIDTH)
+    world_h = float(c.SCREEN_HEIGHT)
+    for _, x, y, w, h in level.records():
+        world_w = max(world_w, x + w)
+        world_h = max(world_h, y + h)
+    scale = min(width / world_w, height / world_h)
+
+    image = Image.new("RGBA", (width, height), SKY_COLOR)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, height - 2, width, height), fill=GROUND_COLOR)
+    for kind, x, y, w, h in level.records():
+        # PIL's y axis points down
+        left = x * scale
+        top = height - (y + h) * scale
+        right = max(left + 1, (x + w) * scale)
+        bottom = max(top + 1, height - y * scale)
+        draw.rectangle((left, top, right, bottom), fill=KIND_COLORS[kind])
+    return image
+
+
+class ThumbnailAtlas:
+    """All level thumbnails packed into one image, plus an index of where each one is."""
+
+    def __init__(self, levels_dir=registry.levels_dir):
+        cache_dir = os.path.join(levels_dir, level_cache.CACHE_DIR_NAME)
+        self.atlas_path = os.path.join(cache_dir, ATLAS_NAME)
+        self.index_path = os.path.join(cache_dir, INDEX_NAME)
+        self.rects = {}  # level file name -> (x, y, w, h) in the atlas image
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (index.get("version") != INDEX_VERSION
+                or index.get("size") != [c.THUMBNAIL_WIDTH, c.THUMBNAIL_HEIGHT]):
+            return {}
+        return index.get("levels", {})
+
+    def update(self, levels):
+        """
+        Make sure the atlas holds a current thumbnail for every level.
+
+        If every level's hash matches the index, the atlas is just read from
+        disk. Otherwise unchanged thumbnails are copied over from the old
+        atlas and only levels with a new hash are rendered. Returns the atlas
+        image. Only PIL is used, so this can run off the main thread.
+        """
+        old_index = self.load_index()
+        old_atlas = None
+        if old_index and os.path.exists(self.atlas_path):
+            old_atlas = Image.open(self.atlas_path)
+            old_atlas.load()
+
+        names = [os.path.basename(level.path) for level in levels]
+        up_to_date = old_atlas is not None and set(names) == old_index.keys() and all(
+            old_index[name]["hash"] == level.hash for name, level in zip(names, levels)
+        )
+        if up_to_date:
+            # Nothing changed: the atlas on disk is used as is
+            self.rects = {}
+            for name, level in zip(names, levels):
+                self.rects[name] = tuple(old_index[name]["rect"])
+                level.thumbnail = list(old_index[name]["rect"])
+            return old_atlas
+
+        width, height = c.THUMBNAIL_WIDTH, c.THUMBNAIL_HEIGHT
+        columns = c.THUMBNAIL_ATLAS_COLUMNS
+        rows = max(1, -(-len(levels) // columns))
+        atlas = Image.new("RGBA", (columns * width, rows * height), (0, 0, 0, 0))
+
+        index = {}
+        self.rects = {}
+        rendered = 0
+        for slot, (name, level) in enumerate(zip(names, levels)):
+            rect = [(slot % columns) * width, (slot // columns) * height, width, height]
+            old = old_index.get(name)
+            if old_atlas is not None and old and old["hash"] == level.hash:
+                x, y, w, h = old["rect"]
+                thumbnail = old_atlas.crop((x, y, x + w, y + h))
+            else:
+                thumbnail = render_thumbnail(level_cache.load_level(level.path))
+                rendered += 1
+            atlas.paste(thumbnail, (rect[0], rect[1]))
+            index[name] = {"hash": level.hash, "rect": rect}
+            self.rects[name] = tuple(rect)
+            level.thumbnail = rect
+
+        if index != old_index:
+            level_cache.atomic_write(self.atlas_path, lambda f: atlas.save(f, format="PNG"))
+            data = {
+                "version": INDEX_VERSION,
+                "size": [width, height],
+                "levels": index,
+            }
+            level_cache.atomic_write(self.index_path, lambda f: json.dump(data, f, indent=1), 'w')
+            print(f"Thumbnails: rendered {rendered}, reused {len(levels) - rendered}")
+        return atlas
+
+
+def main():
+    levels = registry.refresh()
+    ThumbnailAtlas().update(levels)
+    registry.save_manifest()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# src/trajectory.py
+import math
+
+import arcade
+from src import constants as c
+from src.simulation import throw_impulse
+
+DOT_RADIUS = 5  # Radius of the first (largest) dot, in pixels
+
+
+def arc_points(start, impulse, mass, gravity, damping, interval, count, floor_y=0):
+    """
+    Predict where a launched body will be every `interval` seconds.
+
+    Solves dv/dt = g - k*v in closed form, where k comes from pymunk's damping
+    (the fraction of velocity kept per second). Stops early below floor_y.
+    """
+    vx = impulse[0] / mass
+    vy = impulse[1] / mass
+    gx, gy = gravity
+    k = -math.log(damping) if 0 < damping < 1 else 0.0
+
+    points = []
+    for i in range(1, count + 1):
+        t = i * interval
+        if k == 0.0:
+            x = start[0] + vx * t + 0.5 * gx * t * t
+            y = start[1] + vy * t + 0.5 * gy * t * t
+        else:
+            decay = (1 - math.exp(-k * t)) / k
+            x = start[0] + vx * decay + gx / k * (t - decay)
+            y = start[1] + vy * decay + gy / k * (t - decay)
+        if y < floor_y:
+            break
+        points.append((x, y))
+    return points
+
+
+class TrajectoryPreview:
+    """
+    Dotted flight path shown while aiming.
+
+    The dots are a fixed set of sprites in one SpriteList made up front; a
+    new drag only moves them (and hides the ones past the end of the arc),
+    so aiming allocates nothing. The arc is recomputed only when the drag
+    moves more than TRAJECTORY_REBUILD_THRESHOLD.
+    """
+
+    def __init__(self, mass=c.BANANA_MASS, damping=c.DEFAULT_DAMPING):
+        self.mass = mass
+        self.damping = damping
+        self.drag = None
+        self.visible = False
+        self.dots = arcade.SpriteList()
+        for i in range(c.TRAJECTORY_DOTS):
+            dot = arcade.SpriteCircle(DOT_RADIUS, arcade.color.WHITE)
+            # Dots shrink along the path
+            dot.scale = max(2.0, DOT_RADIUS - 3.0 * i / c.TRAJECTORY_DOTS) / DOT_RADIUS
+            dot.visible = False
+            self.dots.append(dot)
+
+    def set_body(self, mass, damping):
+        """Predict the flight of a different banana type from the next update on."""
+        self.mass = mass
+        self.damping = damping
+        self.drag = None
+
+    def update(self, drag_start, drag_end):
+        """Recompute the arc for a new drag, if it changed enough to matter."""
+        drag = (drag_start[0] - drag_end[0], drag_start[1] - drag_end[1])
+        if self.drag is not None:
+            moved = math.hypot(drag[0] - self.drag[0], drag[1] - self.drag[1])
+            if moved < c.TRAJECTORY_REBUILD_THRESHOLD:
+                return
+        self.drag = drag
+
+        impulse = throw_impulse(drag_start, drag_end)
+        points = arc_points(
+            c.BANANA_START_POS, impulse, self.mass, c.GRAVITY, self.damping,
+            c.TRAJECTORY_DOT_INTERVAL, c.TRAJECTORY_DOTS
+        )
+        for i, dot in enumerate(self.dots):
+            if i < len(points):
+                dot.position = points[i]
+                dot.visible = True
+            else:
+                dot.visible = False
+        self.visible = True
+
+    def clear(self):
+        self.visible = False
+        self.drag = None
+
+    def draw(self):
+        if self.visible:
+            self.dots.draw()
@@ -1,8 +1,18 @@
 # src/views/game_view.py
 import arcade
 from src import constants as c
-from src.entities import PlayerMonkey, Banana, EnemyMonkey, BambooBlock, WoodBlock
+from src import replay
+from src import terrain
+from pyglet.graphics import Batch
+from src.entities import PlayerMonkey
+from src.level_registry import registry
+from src.profiler import profiler
 from src.progress import progress
+from src.projectiles import projectiles
+from src.scheduler import PhysicsScheduler
+from src.simulation import Simulation, throw_impulse
+from src.sound import sfx
+from src.trajectory import TrajectoryPreview
 
 
 class GameView(arcade.View):
@@ -16,20 +26,16 @@ class GameView(arcade.View):
 
         # --- Sprite Lists ---
         self.player_list = arcade.SpriteList()
-        self.banana_list = arcade.SpriteList()
-        self.enemy_list = arcade.SpriteList()
-        self.bamboo_list = arcade.SpriteList()
-        self.wood_list = arcade.SpriteList()
 
-        # --- Physics Engine ---
-        self.physics_engine = None
+        # --- World (physics, blocks, enemies, bananas) ---
+        self.sim = None
+        self.scheduler = None
 
         # --- Player Throwing Logic ---
         self.throw_start_pos = None
         self.throw_end_pos = None
-
-        # --- Tilemap ---
-        self.tile_map = None
+        self.projectile = None
+        self.trajectory = None
 
         # --- Level tracking ---
         self.level_number = level_number
@@ -38,63 +44,32 @@ class GameView(arcade.View):
 
         # --- UI Text ---
         self.level_text = None
+        self.projectile_text = None
+        self.complete_batch = Batch()
+        self.complete_texts = []
 
-    def setup(self, map_file=None):
+    def setup(self, map_file=None, sim=None):
         """
-        Set up the game. Call this to restart the level.
+        Set up the game.
 
         Args:
             map_file: Optional path to a Tiled .tmx file
+            sim: An already built Simulation (from the background loader)
         """
 
-        # 1. --- Initialize Physics Engine ---
-        self.physics_engine = arcade.PymunkPhysicsEngine(
-            damping=c.DEFAULT_DAMPING,
-            gravity=c.GRAVITY
-        )
+        # 1. --- Build the World ---
+        if sim is None:
+            sim = Simulation(map_file)
+            terrain.prepare(sim)
+        self.sim = sim
+        self.scheduler = PhysicsScheduler(sim)
+        sfx.load()
 
         # 2. --- Create the Player ---
         self.player = PlayerMonkey()
         self.player_list.append(self.player)
 
-        # 3. --- Create the Ground ---
-        ground = arcade.SpriteSolidColor(2000, 20, arcade.color.BURLYWOOD)
-        ground.position = (c.SCREEN_WIDTH / 2, 10)
-        self.physics_engine.add_sprite(
-            ground,
-            friction=1.0,
-            body_type=arcade.PymunkPhysicsEngine.STATIC
-        )
-
-        # 4. --- Build the Level ---
-        if map_file:
-            self.load_tilemap(map_file)
-        else:
-            self.build_default_level()
-
-        # 5. --- Add Sprite Lists to Physics Engine ---
-        self.physics_engine.add_sprite_list(
-            self.enemy_list,
-            mass=c.ENEMY_MASS,
-            friction=c.ENEMY_FRICTION
-        )
-        self.physics_engine.add_sprite_list(
-            self.bamboo_list,
-            mass=c.BAMBOO_MASS,
-            friction=c.BAMBOO_FRICTION
-        )
-        self.physics_engine.add_sprite_list(
-            self.wood_list,
-            mass=c.WOOD_MASS,
-            friction=c.WOOD_FRICTION
-        )
-        self.physics_engine.add_sprite_list(
-            self.banana_list,
-            mass=c.BANANA_MASS,
-            friction=c.BANANA_FRICTION
-        )
-
-        # 6. --- Create UI Text ---
+        # 3. --- Create UI Text ---
         if self.level_number:
             self.level_text = arcade.Text(
                 f"Level {self.level_number}",
@@ -104,80 +79,36 @@ class GameView(arcade.View):
                 bold=True
             )
 
-    def load_tilemap(self, map_file):
-        """Load a Tiled map using arcade.load_tilemap."""
-        try:
-            # Load the tilemap
-            self.tile_map = arcade.load_tilemap(map_file, scaling=1.0)
-        except Exception as e:
-            print(f"Error loading tilemap: {e}")
-            print("Falling back to default level")
-            self.build_default_level()
-            return
+        # 4. --- Banana type (number keys switch) ---
+        self.projectile_text = arcade.Text(
+            "",
+            10, c.SCREEN_HEIGHT - 56,
+            arcade.color.BLACK,
+            font_size=14
+        )
+        self.trajectory = TrajectoryPreview()
+        self.select_projectile(projectiles.names[0])
 
-        # Get sprite lists from object layers based on their layer names
-        # In Tiled, create Object Layers named: "Bamboo", "Wood", "Enemies"
-
-        if "Bamboo" in self.tile_map.object_lists:
-            for obj in self.tile_map.object_lists["Bamboo"]:
-                bamboo = BambooBlock()
-                bl = obj.shape[0]  # bottom-left
-                tr = obj.shape[2]  # top-right
-                bamboo.center_x = (bl[0] + tr[0]) / 2
-                bamboo.center_y = (bl[1] + tr[1]) / 2
-                self.bamboo_list.append(bamboo)
-
-        if "Wood" in self.tile_map.object_lists:
-            for obj in self.tile_map.object_lists["Wood"]:
-                wood = WoodBlock()
-                bl = obj.shape[0]
-                tr = obj.shape[2]
-                wood.center_x = (bl[0] + tr[0]) / 2
-                wood.center_y = (bl[1] + tr[1]) / 2
-                self.wood_list.append(wood)
-
-        if "Monkeys" in self.tile_map.object_lists:
-            for obj in self.tile_map.object_lists["Monkeys"]:
-                bl = obj.shape[0]
-                tr = obj.shape[2]
-                enemy = EnemyMonkey(
-                    x=(bl[0] + tr[0]) / 2,
-                    y=(bl[1] + tr[1]) / 2,
-                    width=tr[0] - bl[0],
-                    height=tr[1] - bl[1]
-                )
-                self.enemy_list.append(enemy)
-
-        print(f"Loaded: {len(self.bamboo_list)} bamboo, {len(self.wood_list)} wood, {len(self.enemy_list)} enemies")
-
-    def build_default_level(self):
-        """Build a default programmatic level."""
-        tower_x = c.SCREEN_WIDTH - 200
-
-        # Base - mix of bamboo and wood
-        bamboo1 = BambooBlock((tower_x - 50, 60))
-        self.bamboo_list.append(bamboo1)
-
-        wood1 = WoodBlock((tower_x, 60))
-        self.wood_list.append(wood1)
-
-        bamboo2 = BambooBlock((tower_x + 50, 60))
-        self.bamboo_list.append(bamboo2)
-
-        # Enemy 1
-        enemy1 = EnemyMonkey(x=tower_x, y=100, width=32, height=32)
-        self.enemy_list.append(enemy1)
-
-        # Second floor
-        wood2 = WoodBlock((tower_x - 25, 140))
-        self.wood_list.append(wood2)
-
-        wood3 = WoodBlock((tower_x + 25, 140))
-        self.wood_list.append(wood3)
-
-        # Enemy 2
-        enemy2 = EnemyMonkey(x=tower_x, y=180, width=32, height=32)
-        self.enemy_list.append(enemy2)
+        # 5. --- Level complete banner (built once, drawn as one batch) ---
+        self.complete_texts = [
+            arcade.Text(
+                "LEVEL COMPLETE!",
+                c.SCREEN_WIDTH / 2, c.SCREEN_HEIGHT / 2 + 40,
+                arcade.color.YELLOW,
+                font_size=40,
+                anchor_x="center",
+                bold=True,
+                batch=self.complete_batch
+            ),
+            arcade.Text(
+                "Returning to level select...",
+                c.SCREEN_WIDTH / 2, c.SCREEN_HEIGHT / 2 - 20,
+                arcade.color.WHITE,
+                font_size=20,
+                anchor_x="center",
+                batch=self.complete_batch
+            ),
+        ]
 
     # --- Game Loop Methods ---
     def on_draw(self):
@@ -185,11 +116,11 @@ class GameView(arcade.View):
         self.clear()
 
         # Draw all sprite lists
-        self.bamboo_list.draw()
-        self.wood_list.draw()
-        self.enemy_list.draw()
-        self.banana_list.draw()
-        self.player_list.draw()
+        for name, sprite_list in self.sim.named_sprite_lists():
+            with profiler.section(f"draw.{name}"):
+                sprite_list.draw()
+        with profiler.section("draw.player_list"):
+            self.player_list.draw()
 
         # Draw the "slingshot" line
         if self.throw_start_pos and self.throw_end_pos:
@@ -198,38 +129,47 @@ class GameView(arcade.View):
                 self.throw_end_pos[0], self.throw_end_pos[1],
                 arcade.color.BROWN, 4
             )
+            self.trajectory.draw()
 
         # Draw level text
         if self.level_text:
             self.level_text.draw()
+        self.projectile_text.draw()
 
         # Draw level complete message
         if self.level_complete:
-
-            arcade.draw_text(
-                "LEVEL COMPLETE!",
-                c.SCREEN_WIDTH / 2, c.SCREEN_HEIGHT / 2 + 40,
-                arcade.color.YELLOW,
-                font_size=40,
-                anchor_x="center",
-                bold=True
-            )
-            arcade.draw_text(
-                "Returning to level select...",
-                c.SCREEN_WIDTH / 2, c.SCREEN_HEIGHT / 2 - 20,
-                arcade.color.WHITE,
-                font_size=20,
-                anchor_x="center"
-            )
+            self.complete_batch.draw()
+
+        # Draw profiler stats (F3, when started with --profile)
+        if profiler.overlay_visible:
+            active, sleeping = self.sim.body_counts()
+            spatial = self.sim.spatial.stats()
+            physics = self.scheduler.stats()
+            sound = sfx.stats()
+            profiler.draw_overlay([
+                f"bodies: {active} active, {sleeping} sleeping",
+                f"physics: {physics['tier']} quality, {physics['cost_ms']:.1f}/{physics['budget_ms']:.1f} ms, "
+                f"{physics['dropped_steps']} steps dropped",
+                f"spatial: {spatial['indexed']} indexed in {spatial['cells']} cells, "
+                f"{spatial['moved']}/{spatial['checked']} moved, "
+                f"{spatial['queries']} queries ({spatial['candidates']} candidates)",
+                "pools: " + ", ".join(
+                    f"{key} {pool.created} made/{pool.reused} reused"
+                    for key, pool in self.sim.pools.items()
+                ),
+                f"sfx: {sound['busy']}/{sound['voices']} voices busy, {sound['played']} played, "
+                f"{sound['dropped']} dropped, {sound['stolen']} stolen",
+            ])
+            self.sim.spatial.reset_stats()
 
     def on_update(self, delta_time):
         """ Run physics and handle collisions """
         if not self.level_complete:
-            self.physics_engine.step(delta_time)
-            self.check_collisions()
+            self.scheduler.update(delta_time)
+            self.play_sounds()
 
             # Check if level is complete (all enemies defeated)
-            if len(self.enemy_list) == 0 and self.level_number:
+            if self.sim.is_cleared and self.level_number:
                 self.complete_level()
         else:
             # Count down timer to return to level select
@@ -237,64 +177,45 @@ class GameView(arcade.View):
             if self.level_complete_timer > 2.0:  # Wait 2 seconds
                 self.return_to_level_select()
 
+    def play_sounds(self):
+        """Play what happened in the world since the last frame."""
+        if self.sim.events:
+            sfx.play_events(self.sim.events)
+            self.sim.events.clear()
+
     def complete_level(self):
         """Mark the level as complete."""
         self.level_complete = True
         self.level_complete_timer = 0
-        progress.complete_level(self.level_number)
-        print(f"Level {self.level_number} complete! Level {self.level_number + 1} unlocked!")
+        next_number = registry.next_number(self.level_number)
+        if next_number is None:
+            next_number = self.level_number + 1
+        progress.record_result(
+            self.level_number, self.sim.score(), self.sim.launch_count, self.sim.elapsed
+        )
+        progress.complete_level(self.level_number, next_number)
+        print(f"Level {self.level_number} complete! Level {next_number} unlocked!")
+        self.save_replay()
+
+    def save_replay(self):
+        """Save the attempt so far as a replay, if anything was launched."""
+        if not self.sim.launches:
+            return
+        recording = replay.record(self.sim)
+        path = replay.replay_path(recording.level_path)
+        try:
+            recording.save(path)
+        except OSError as e:
+            print(f"Warning: could not save replay to {path}: {e}")
 
     def return_to_level_select(self):
         """Return to the level selection screen."""
+        if not self.level_complete:
+            self.save_replay()
         from src.views.level_select_view import LevelSelectView
         level_select = LevelSelectView()
         self.window.show_view(level_select)
 
-    def check_collisions(self):
-        """Handle collision logic."""
-
-        # Check banana hitting bamboo - bamboo breaks and slows banana
-        for banana in self.banana_list:
-            bamboo_hit = arcade.check_for_collision_with_list(banana, self.bamboo_list)
-            for bamboo in bamboo_hit:
-                phys_obj = self.physics_engine.get_physics_object(banana)
-                if phys_obj:
-                    velocity = phys_obj.body.velocity
-                    speed = (velocity.x ** 2 + velocity.y ** 2) ** 0.5
-
-                    if speed > c.COLLISION_SPEED_THRESHOLD:
-                        # Break the bamboo
-                        bamboo.remove_from_sprite_lists()
-
-                        # Slow down banana
-                        phys_obj.body.velocity = velocity * 0.5
-
-        # Check enemies hit by banana, wood, or falling
-        for enemy in list(self.enemy_list):
-            # Check banana collision
-            banana_hit = arcade.check_for_collision_with_list(enemy, self.banana_list)
-
-            # Check wood collision
-            wood_hit = arcade.check_for_collision_with_list(enemy, self.wood_list)
-
-            if banana_hit:
-                # Enemy disappears
-                print("confirm")
-                enemy.remove_from_sprite_lists()
-
-        # Wood can also break bamboo when falling
-        for wood in self.wood_list:
-            bamboo_hit = arcade.check_for_collision_with_list(wood, self.bamboo_list)
-            for bamboo in bamboo_hit:
-                phys_obj = self.physics_engine.get_physics_object(wood)
-                if phys_obj:
-                    velocity = phys_obj.body.velocity
-                    speed = (velocity.x ** 2 + velocity.y ** 2) ** 0.5
-
-                    if speed > c.COLLISION_SPEED_THRESHOLD:
-                        # Break the bamboo
-                        bamboo.remove_from_sprite_lists()
-
     # --- Mouse Control Methods ---
     def on_mouse_press(self, x, y, button, modifiers):
         """ Store the start position of the "throw" """
@@ -304,34 +225,49 @@ class GameView(arcade.View):
 
     def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
         """ Update the end position of the "throw" """
-        if buttons & arcade.MOUSE_BUTTON_LEFT:
+        if buttons & arcade.MOUSE_BUTTON_LEFT and self.throw_start_pos:
             self.throw_end_pos = (x, y)
+            self.trajectory.update(self.throw_start_pos, self.throw_end_pos)
 
     def on_mouse_release(self, x, y, button, modifiers):
         """ Launch the banana! """
         if button == arcade.MOUSE_BUTTON_LEFT and self.throw_start_pos:
-            start_x, start_y = self.throw_start_pos
-            end_x, end_y = x, y
-
-            # Calculate the force
-            force_x = (start_x - end_x) * c.THROW_FORCE_MULTIPLIER
-            force_y = (start_y - end_y) * c.THROW_FORCE_MULTIPLIER
-            force = (force_x, force_y)
-
-            # Create the banana
-            banana = Banana()
-            banana.position = c.BANANA_START_POS
-            self.banana_list.append(banana)
-            self.physics_engine.add_sprite(banana, mass=c.BANANA_MASS, friction=c.BANANA_FRICTION)
-
-            # Apply the force
-            self.physics_engine.apply_impulse(banana, force)
+            # Calculate the force and launch the banana (dropped while the level settles or too soon after the last one)
+            force = throw_impulse(self.throw_start_pos, (x, y))
+            if self.sim.can_launch():
+                self.sim.launch(force, self.projectile)
 
             # Reset the throw line
             self.throw_start_pos = None
             self.throw_end_pos = None
+            self.trajectory.clear()
 
     def on_key_press(self, key, modifiers):
         """Handle key presses."""
         if key == arcade.key.ESCAPE and not self.level_complete:
-            self.return_to_level_select()
\ No newline at end of file
+            self.return_to_level_select()
+        elif key == arcade.key.R and not self.level_complete:
+            self.restart_level()
+        elif key == arcade.key.F3:
+            profiler.toggle_overlay()
+        elif arcade.key.KEY_1 <= key <= arcade.key.KEY_9:
+            names = projectiles.names
+            index = key - arcade.key.KEY_1
+            if index < len(names):
+                self.select_projectile(names[index])
+
+    def select_projectile(self, name):
+        """Choose the banana type for the next throws; the preview follows its physics."""
+        kind = projectiles.get(name)
+        self.projectile = name
+        self.trajectory.set_body(kind.mass, kind.damping)
+        count = len(projectiles.names)
+        self.projectile_text.text = f"Banana: {name} (1-{count} to switch)"
+
+    def restart_level(self):
+        """Restart the level in place: nothing is reloaded and the level keeps its bodies."""
+        self.save_replay()
+        self.sim.reset()
+        self.throw_start_pos = None
+        self.throw_end_pos = None
+        self.trajectory.clear()
\ No newline at end of file
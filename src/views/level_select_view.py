@@ -1,16 +1,20 @@
 # src/views/level_select_view.py
 import arcade
-import os
+from arcade.shape_list import ShapeElementList, create_rectangle_filled, create_rectangle_outline
+from pyglet.graphics import Batch
 from src import constants as c
-from src.views.game_view import GameView
+from src.level_registry import registry
+from src.loader import level_loader
+from src.thumbnails import ThumbnailAtlas
+from src.views.loading_view import LoadingView
 from src.progress import progress
 
 
 class LevelButton:
     """A button for selecting a level."""
 
-    def __init__(self, level_number, x, y, width, height, unlocked):
-        self.level_number = level_number
+    def __init__(self, level, x, y, width, height, unlocked, batch):
+        self.level_number = level.number
         self.x = x
         self.y = y
         self.width = width
@@ -18,58 +22,88 @@ class LevelButton:
         self.unlocked = unlocked
         self.hovered = False
 
+        # Text is laid out once and drawn with the rest of the page's batch
+        self.label = arcade.Text(
+            level.display_title,
+            self.x, self.y - 22,
+            self.text_color,
+            font_size=14,
+            anchor_x="center",
+            anchor_y="center",
+            bold=True,
+            batch=batch
+        )
+        self.info = None
+        self.lock_icon = None
+        if self.unlocked:
+            self.info = arcade.Text(
+                f"{level.enemies} monkeys, {level.blocks} blocks",
+                self.x, self.y - 42,
+                self.text_color,
+                font_size=9,
+                anchor_x="center",
+                anchor_y="center",
+                batch=batch
+            )
+        else:
+            self.lock_icon = arcade.Text(
+                "🔒",
+                self.x, self.y + 18,
+                arcade.color.DARK_GRAY,
+                font_size=24,
+                anchor_x="center",
+                anchor_y="center",
+                batch=batch
+            )
+
     def is_point_inside(self, x, y):
         """Check if a point is inside the button."""
         return (self.x - self.width / 2 < x < self.x + self.width / 2 and
                 self.y - self.height / 2 < y < self.y + self.height / 2)
 
-    def draw(self):
-        """Draw the button."""
-        # Choose colors based on state
+    @property
+    def color(self):
         if not self.unlocked:
-            color = arcade.color.GRAY
-            text_color = arcade.color.DARK_GRAY
+            return arcade.color.GRAY
         elif self.hovered:
-            color = arcade.color.ORANGE
-            text_color = arcade.color.WHITE
-        else:
-            color = arcade.color.BROWN
-            text_color = arcade.color.WHITE
-
-        # Draw button background (filled rectangle)
-        left = self.x - self.width / 2
-        right = self.x + self.width / 2
-        bottom = self.y - self.height / 2
-        top = self.y + self.height / 2
-        arcade.draw_lrbt_rectangle_filled(left, right, bottom, top, color)
-
-        # Draw border
-        arcade.draw_lrbt_rectangle_outline(
-            left, right, bottom, top,
-            arcade.color.BLACK, 3
-        )
-
-        # Draw level number
-        arcade.draw_text(
-            f"Level {self.level_number}",
-            self.x, self.y,
-            text_color,
-            font_size=20,
-            anchor_x="center",
-            anchor_y="center",
-            bold=True
-        )
+            return arcade.color.ORANGE
+        return arcade.color.BROWN
 
-        # Draw lock icon if locked
+    @property
+    def text_color(self):
         if not self.unlocked:
-            arcade.draw_text(
-                "🔒",
-                self.x, self.y - 35,
-                arcade.color.DARK_GRAY,
-                font_size=16,
-                anchor_x="center",
-                anchor_y="center"
-            )
+            return arcade.color.DARK_GRAY
+        return arcade.color.WHITE
+
+    def set_hovered(self, hovered):
+        """Update hover state. Returns True if the button needs redrawing."""
+        if hovered == self.hovered:
+            return False
+        self.hovered = hovered
+        return True
+
+    def add_shapes(self, shape_list):
+        """Add the button background and border to a shared shape list."""
+        shape_list.append(create_rectangle_filled(
+            self.x, self.y, self.width, self.height, self.color
+        ))
+        shape_list.append(create_rectangle_outline(
+            self.x, self.y, self.width, self.height, arcade.color.BLACK, 3
+        ))
+
+    def add_placeholder(self, shape_list):
+        """Add a blank thumbnail frame, shown until the level's preview is ready."""
+        shape_list.append(create_rectangle_filled(
+            self.x, self.y + 18, c.THUMBNAIL_WIDTH, c.THUMBNAIL_HEIGHT, arcade.color.LIGHT_GRAY
+        ))
+
+    def delete(self):
+        """Take the button's text out of the batch."""
+        self.label.batch = None
+        if self.info:
+            self.info.batch = None
+        if self.lock_icon:
+            self.lock_icon.batch = None
 
 
 class LevelSelectView(arcade.View):
@@ -79,20 +113,49 @@ class LevelSelectView(arcade.View):
         super().__init__()
         self.buttons = []
         self.available_levels = []
+        self.page = 0
+        self.page_count = 1
+
+        # All static text on the screen is drawn through this one batch
+        self.batch = Batch()
+        self.button_shapes = None
+        self.shapes_dirty = True
+
+        # Level previews: one atlas image, one sprite list for the page.
+        # The atlas is brought up to date on the loader thread; until it is,
+        # unlocked buttons show a blank placeholder.
+        self.thumbnail_job = None
+        self.thumbnail_atlas = None
+        self.thumbnail_textures = {}
+        self.thumbnail_list = arcade.SpriteList()
+
         self.title_text = None
         self.back_text = None
+        self.page_text = None
+        self.empty_texts = []
 
     def on_show_view(self):
         """Set up the view when shown."""
         arcade.set_background_color(arcade.color.LIGHT_BLUE)
 
         # Find available level files
-        self.available_levels = self.find_level_files()
+        self.available_levels = registry.refresh()
+        self.page_count = max(1, -(-len(self.available_levels) // c.LEVELS_PER_PAGE))
+        self.page = min(self.page, self.page_count - 1)
+
+        # Redraws only the thumbnails of levels that changed since last time
+        self.thumbnail_atlas = None
+        self.thumbnail_job = level_loader.executor.submit(ThumbnailAtlas().update, self.available_levels)
+
+        # Create text objects
+        if self.title_text is None:
+            self.create_text()
 
         # Create buttons
         self.create_buttons()
 
-        # Create text objects
+    def create_text(self):
+        """Build the screen's fixed text once."""
         self.title_text = arcade.Text(
             "Select Level",
             c.SCREEN_WIDTH / 2,
@@ -100,7 +163,8 @@ class LevelSelectView(arcade.View):
             arcade.color.BROWN,
             font_size=50,
             anchor_x="center",
-            bold=True
+            bold=True,
+            batch=self.batch
         )
 
         self.back_text = arcade.Text(
@@ -109,93 +173,131 @@ class LevelSelectView(arcade.View):
             40,
             arcade.color.GRAY,
             font_size=18,
-            anchor_x="center"
+            anchor_x="center",
+            batch=self.batch
         )
 
-    def find_level_files(self):
-        """Find all level files in assets/levels/"""
-        levels_dir = "assets/levels"
-        levels = []
-
-        if not os.path.exists(levels_dir):
-            print(f"Warning: {levels_dir} directory not found!")
-            return levels
-
-        # Look for level1.tmx, level2.tmx, etc.
-        level_num = 1
-        while True:
-            level_file = os.path.join(levels_dir, f"level{level_num}.tmx")
-            if os.path.exists(level_file):
-                levels.append((level_num, level_file))
-                level_num += 1
-            else:
-                break
+        self.page_text = arcade.Text(
+            "",
+            c.SCREEN_WIDTH / 2,
+            75,
+            arcade.color.GRAY,
+            font_size=14,
+            anchor_x="center",
+            batch=self.batch
+        )
 
-        return levels
+        # Info message if no levels found
+        if not self.available_levels:
+            self.empty_texts.append(arcade.Text(
+                "No levels found in assets/levels/",
+                c.SCREEN_WIDTH / 2,
+                c.SCREEN_HEIGHT / 2,
+                arcade.color.RED,
+                font_size=24,
+                anchor_x="center",
+                batch=self.batch
+            ))
+            self.empty_texts.append(arcade.Text(
+                "Create level1.tmx, level2.tmx, etc. in that folder",
+                c.SCREEN_WIDTH / 2,
+                c.SCREEN_HEIGHT / 2 - 40,
+                arcade.color.GRAY,
+                font_size=16,
+                anchor_x="center",
+                batch=self.batch
+            ))
 
     def create_buttons(self):
-        """Create level selection buttons."""
+        """Create the level selection buttons for the current page."""
+        for button in self.buttons:
+            button.delete()
         self.buttons = []
+        self.thumbnail_list.clear()
 
         # Button dimensions
         button_width = 150
-        button_height = 80
-        buttons_per_row = 4
+        button_height = 110
+        buttons_per_row = c.LEVEL_BUTTONS_PER_ROW
         padding = 20
 
         # Calculate starting position
         start_x = (c.SCREEN_WIDTH - (buttons_per_row * (button_width + padding))) / 2 + button_width / 2
         start_y = c.SCREEN_HEIGHT - 200
 
-        for i, (level_num, _) in enumerate(self.available_levels):
+        first = self.page * c.LEVELS_PER_PAGE
+        page_levels = self.available_levels[first:first + c.LEVELS_PER_PAGE]
+        for i, level in enumerate(page_levels):
             row = i // buttons_per_row
             col = i % buttons_per_row
 
             x = start_x + col * (button_width + padding)
             y = start_y - row * (button_height + padding)
 
-            unlocked = progress.is_level_unlocked(level_num)
+            # The first level of a pack is always playable, whatever its number
+            unlocked = progress.is_level_unlocked(level.number) or level is self.available_levels[0]
 
-            button = LevelButton(level_num, x, y, button_width, button_height, unlocked)
+            button = LevelButton(level, x, y, button_width, button_height, unlocked, self.batch)
             self.buttons.append(button)
 
+            if unlocked and self.thumbnail_atlas is not None and level.thumbnail:
+                thumbnail = arcade.Sprite(self.thumbnail_texture(level))
+                thumbnail.position = (x, y + 18)
+                self.thumbnail_list.append(thumbnail)
+
+        if self.page_count > 1:
+            self.page_text.text = f"Page {self.page + 1}/{self.page_count}  (LEFT/RIGHT to change)"
+        self.shapes_dirty = True
+
+    def thumbnail_texture(self, level):
+        """Texture for a level's slot in the thumbnail atlas (cut out once per view)."""
+        texture = self.thumbnail_textures.get(level.hash)
+        if texture is None:
+            x, y, w, h = level.thumbnail
+            texture = arcade.Texture(
+                self.thumbnail_atlas.crop((x, y, x + w, y + h)),
+                hash=f"thumbnail-{level.hash}",
+                hit_box_algorithm=arcade.hitbox.algo_bounding_box
+            )
+            self.thumbnail_textures[level.hash] = texture
+        return texture
+
+    def on_update(self, delta_time):
+        """Show the thumbnails once the loader thread has them ready."""
+        if self.thumbnail_job is None or not self.thumbnail_job.done():
+            return
+        job, self.thumbnail_job = self.thumbnail_job, None
+        if job.exception() is not None:
+            print(f"Warning: could not build level thumbnails: {job.exception()}")
+            return
+        self.thumbnail_atlas = job.result()
+        self.create_buttons()
+
     def on_draw(self):
         """Draw the level selection screen."""
         self.clear()
 
-        # Draw title
-        self.title_text.draw()
+        # Button shapes are rebuilt only when hover state, the page or the thumbnails change
+        if self.shapes_dirty:
+            self.button_shapes = ShapeElementList()
+            for button in self.buttons:
+                button.add_shapes(self.button_shapes)
+                if button.unlocked and self.thumbnail_atlas is None:
+                    button.add_placeholder(self.button_shapes)
+            self.shapes_dirty = False
+        self.button_shapes.draw()
 
-        # Draw all buttons
-        for button in self.buttons:
-            button.draw()
+        # Every thumbnail on the page in one draw call
+        self.thumbnail_list.draw()
 
-        # Draw back text
-        self.back_text.draw()
-
-        # Draw info message if no levels found
-        if not self.available_levels:
-            arcade.draw_text(
-                "No levels found in assets/levels/",
-                c.SCREEN_WIDTH / 2,
-                c.SCREEN_HEIGHT / 2,
-                arcade.color.RED,
-                font_size=24,
-                anchor_x="center"
-            )
-            arcade.draw_text(
-                "Create level1.tmx, level2.tmx, etc. in that folder",
-                c.SCREEN_WIDTH / 2,
-                c.SCREEN_HEIGHT / 2 - 40,
-                arcade.color.GRAY,
-                font_size=16,
-                anchor_x="center"
-            )
+        # All text in one draw call
+        self.batch.draw()
 
     def on_mouse_motion(self, x, y, dx, dy):
         """Handle mouse motion for button hover effects."""
         for button in self.buttons:
-            button.hovered = button.is_point_inside(x, y)
+            if button.set_hovered(button.is_point_inside(x, y)):
+                self.shapes_dirty = True
 
     def on_mouse_press(self, x, y, button, modifiers):
         """Handle mouse press to select a level."""
@@ -206,21 +308,24 @@ class LevelSelectView(arcade.View):
 
     def start_level(self, level_number):
         """Start the selected level."""
-        # Find the level file
-        level_file = None
-        for num, file in self.available_levels:
-            if num == level_number:
-                level_file = file
-                break
-
-        if level_file:
-            game_view = GameView(level_number=level_number)
-            game_view.setup(map_file=level_file)
-            self.window.show_view(game_view)
+        level = registry.get(level_number)
+        if level:
+            loading_view = LoadingView(level_number, level.path)
+            self.window.show_view(loading_view)
+
+    def change_page(self, delta):
+        page = max(0, min(self.page_count - 1, self.page + delta))
+        if page != self.page:
+            self.page = page
+            self.create_buttons()
 
     def on_key_press(self, key, modifiers):
         """Handle key presses."""
         if key == arcade.key.ESCAPE:
             from src.views.menu_view import MenuView
             menu_view = MenuView()
-            self.window.show_view(menu_view)
\ No newline at end of file
+            self.window.show_view(menu_view)
+        elif key == arcade.key.RIGHT:
+            self.change_page(1)
+        elif key == arcade.key.LEFT:
+            self.change_page(-1)
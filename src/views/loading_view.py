@@ -0,0 +1,66 @@
+# src/views/loading_view.py
+import arcade
+from src import constants as c
+from src.level_registry import registry
+from src.loader import level_loader
+from src.views.game_view import GameView
+
+
+class LoadingView(arcade.View):
+    """Shows a progress bar while a level loads in the background, then starts it."""
+
+    def __init__(self, level_number, level_file):
+        super().__init__()
+        self.level_number = level_number
+        self.level_file = level_file
+        self.job = level_loader.load(level_file)
+        self.title_text = None
+
+    def on_show_view(self):
+        arcade.set_background_color(arcade.color.WHITE_SMOKE)
+        self.title_text = arcade.Text(
+            f"Loading Level {self.level_number}...",
+            c.SCREEN_WIDTH / 2,
+            c.SCREEN_HEIGHT / 2 + 40,
+            arcade.color.BROWN,
+            font_size=30,
+            anchor_x="center"
+        )
+
+    def on_draw(self):
+        self.clear()
+        self.title_text.draw()
+
+        # Progress bar
+        width = 400
+        height = 24
+        left = c.SCREEN_WIDTH / 2 - width / 2
+        bottom = c.SCREEN_HEIGHT / 2 - height / 2
+        arcade.draw_lrbt_rectangle_filled(
+            left, left + width * self.job.progress, bottom, bottom + height,
+            arcade.color.ORANGE
+        )
+        arcade.draw_lrbt_rectangle_outline(
+            left, left + width, bottom, bottom + height,
+            arcade.color.BLACK, 3
+        )
+
+    def on_update(self, delta_time):
+        if self.job.failed:
+            print(f"Error loading level: {self.job.future.exception()}")
+            self.return_to_level_select()
+            return
+
+        if self.job.upload_step():
+            game_view = GameView(level_number=self.level_number)
+            game_view.setup(sim=self.job.sim)
+            self.window.show_view(game_view)
+
+            # Get the next level ready while this one is played
+            next_number = registry.next_number(self.level_number)
+            if next_number is not None:
+                level_loader.prefetch(registry.get(next_number).path)
+
+    def return_to_level_select(self):
+        from src.views.level_select_view import LevelSelectView
+        self.window.show_view(LevelSelectView())
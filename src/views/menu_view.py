@@ -1,7 +1,8 @@
 # src/views/menu_view.py
 import arcade
 from src import constants as c
-from src.views.level_select_view import LevelSelectView
+from src.assets import assets
+from src.startup import startup
 
 
 class MenuView(arcade.View):
@@ -13,8 +14,10 @@ class MenuView(arcade.View):
         super().__init__()
         self.title_text = None
         self.start_text = None
-        self.background_music = arcade.load_sound('assets/Background-Theme.mp3',streaming=True)
-        arcade.play_sound(self.background_music, loop=True, volume=.5)
+        # Keeps playing across menu visits instead of stacking a new player each time;
+        # loads in the background so the menu shows up first
+        assets.play_music_async('assets/Background-Theme.mp3', volume=.5)
+
     def on_show_view(self):
         arcade.set_background_color(arcade.color.WHITE_SMOKE)
 
@@ -43,8 +46,11 @@ class MenuView(arcade.View):
         self.clear()
         self.title_text.draw()
         self.start_text.draw()
+        startup.first_frame()
 
     def on_mouse_press(self, _x, _y, _button, _modifiers):
         """ Go to level select """
+        # Imported on first use: it pulls in the game, physics and level modules
+        from src.views.level_select_view import LevelSelectView
         level_select = LevelSelectView()
         self.window.show_view(level_select)
\ No newline at end of file
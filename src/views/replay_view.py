@@ -0,0 +1,70 @@
+# src/views/replay_view.py
+import arcade
+from src import constants as c
+from src.views.game_view import GameView
+
+
+class ReplayView(GameView):
+    """Plays a recorded replay back in real time; input is ignored."""
+
+    def __init__(self, recording):
+        super().__init__()
+        self.recording = recording
+        self.next_launch = 0
+        self.next_change = 0
+        self.accumulator = 0.0
+
+    def setup(self, map_file=None, sim=None):
+        from src import terrain
+        from src.simulation import Simulation
+        map_file = self.recording.level_path or None
+        if sim is None:
+            sim = Simulation(map_file, verbose=False, seed=self.recording.seed)
+            terrain.prepare(sim)
+        super().setup(sim=sim)
+        self.level_text = arcade.Text(
+            f"Replay: {map_file or 'default level'}",
+            10, c.SCREEN_HEIGHT - 30,
+            arcade.color.BLACK,
+            font_size=20,
+            bold=True
+        )
+
+    def on_update(self, delta_time):
+        """Step one fixed timestep at a time so launches land on their recorded frame."""
+        self.accumulator += min(delta_time, c.MAX_FRAME_TIME)
+        launches = self.recording.launches
+        changes = self.recording.quality_changes
+        while self.accumulator >= self.sim.dt and self.sim.frame < self.recording.end_frame:
+            while self.next_change < len(changes) and changes[self.next_change][0] == self.sim.frame:
+                self.sim.set_quality(changes[self.next_change][1])
+                self.next_change += 1
+            while self.next_launch < len(launches) and launches[self.next_launch][0] == self.sim.frame:
+                _, impulse_x, impulse_y, projectile = launches[self.next_launch]
+                self.sim.launch((impulse_x, impulse_y), projectile)
+                self.next_launch += 1
+            self.sim.step()
+            self.accumulator -= self.sim.dt
+        self.play_sounds()
+
+    def save_replay(self):
+        """Never record a replay of a replay."""
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        pass
+
+    def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
+        pass
+
+    def on_mouse_release(self, x, y, button, modifiers):
+        pass
+
+    def on_key_press(self, key, modifiers):
+        if key == arcade.key.ESCAPE:
+            self.window.close()
+        elif key == arcade.key.R:
+            self.sim.reset()
+            self.sim.set_quality(0)
+            self.next_launch = 0
+            self.next_change = 0
+            self.accumulator = 0.0
@@ -0,0 +1,80 @@
+# tests/test_damage.py
+import pytest
+
+pytest.importorskip("arcade")
+pymunk = pytest.importorskip("pymunk")
+
+from src import constants as c
+from src.damage import DamageModel
+from src.simulation import Simulation
+
+
+class Block:
+    def __init__(self, material):
+        self.material = material
+
+
+class PhysicsObject:
+    def __init__(self, body):
+        self.body = body
+
+
+class Engine:
+    """Just enough of PymunkPhysicsEngine for DamageModel.build()."""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def get_physics_object(self, sprite):
+        return PhysicsObject(self.bodies[sprite])
+
+
+def hit(material, impulse, mass=1.0):
+    """Give one resting body a single sideways hit; returns True if it broke."""
+    sprite = Block(material)
+    body = pymunk.Body(mass, 1.0)
+    model = DamageModel()
+    model.build(Engine({sprite: body}), [sprite])
+    # Falling at exactly gravity's rate plus the hit: only the hit counts as impulse
+    body.velocity = (impulse / mass, c.GRAVITY[1] * c.PHYSICS_DT)
+    return sprite in model.update(apply_damage=True)
+
+
+@pytest.mark.parametrize("material, multiple", [("bamboo", 1), ("wood", 8), ("enemy", 6)])
+def test_one_hit_break_point(material, multiple):
+    weight = abs(c.GRAVITY[1]) * c.PHYSICS_DT
+    break_point = multiple * c.COLLISION_IMPULSE_THRESHOLD
+    settings = c.MATERIALS[material]
+    assert settings["health"] + settings["threshold"] == pytest.approx(break_point)
+    assert hit(material, break_point * 1.01 + weight)
+    assert not hit(material, break_point * 0.99 + weight)
+
+
+def test_a_throw_does_not_end_the_grace_period():
+    sim = Simulation(verbose=False)
+    assert sim.settling
+    sim.launch((900, 400))
+    assert sim.settling
+    sim.reset()
+    assert sim.settling
+
+
+def test_throw_away_from_the_tower_while_settling_clears_nothing():
+    sim = Simulation("assets/levels/level1.tmx", verbose=False)
+    enemies = len(sim.enemy_list)
+    sim.launch((-200, 0))
+    for _ in range(600):
+        sim.step()
+    assert not sim.is_cleared
+    assert len(sim.enemy_list) == enemies
+
+
+def test_resting_stack_of_monkeys_is_not_crushed(tmp_path):
+    from benchmarks import levels
+    sim = Simulation(levels.generate("enemies", 32, str(tmp_path)), verbose=False)
+    for _ in range(int(20 / c.PHYSICS_DT)):
+        sim.step()
+        if sim.body_counts()[0] == 0:
+            break
+    assert not sim.settling
+    assert len(sim.enemy_list) == 32
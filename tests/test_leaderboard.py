@@ -0,0 +1,89 @@
+# tests/test_leaderboard.py
+import asyncio
+import base64
+import json
+
+import pytest
+
+pytest.importorskip("arcade")
+
+from src import constants as c
+from src import leaderboard
+from src.replay import Replay, record
+from src.simulation import Simulation
+
+
+def ask(request):
+    """One request to a server that isn't listening or verifying, just answering."""
+    async def run():
+        server = leaderboard.LeaderboardServer({leaderboard.DEFAULT_LEVEL_HASH: ""}, workers=0)
+        server.queue = asyncio.Queue(maxsize=server.queue_size)
+        try:
+            return await server.dispatch(json.dumps(request))
+        finally:
+            await server.stop()
+
+    return asyncio.run(run())
+
+
+def encode(replay):
+    return base64.b64encode(replay.to_bytes()).decode()
+
+
+def submit(launches, end_frame=600):
+    replay = Replay("", leaderboard.DEFAULT_LEVEL_HASH)
+    replay.end_frame = end_frame
+    replay.launches = launches
+    return ask({"op": "submit", "player": "ann", "replay": encode(replay)})
+
+
+def test_accepts_throws_a_player_could_make():
+    response = submit([(10, 900.0, 400.0, "normal"), (10 + c.LAUNCH_COOLDOWN_STEPS, 800.0, 300.0, "heavy")])
+    assert response['ok'], response
+
+
+@pytest.mark.parametrize("launches", [
+    [(10, c.MAX_THROW_IMPULSE * 2, 0.0, "normal")],
+    [(10, 900.0, 400.0, "normal"), (11, 900.0, 400.0, "normal")],
+    [(10, 900.0, 400.0, "rocket")],
+    [(frame * c.LAUNCH_COOLDOWN_STEPS, 900.0, 400.0, "normal")
+     for frame in range(leaderboard.MAX_REPLAY_LAUNCHES + 1)],
+])
+def test_rejects_impossible_throws(launches):
+    response = submit(launches, end_frame=leaderboard.MAX_REPLAY_FRAMES)
+    assert not response['ok']
+    assert response['error'].startswith("impossible replay")
+
+
+def test_rejects_a_throw_before_the_level_settled():
+    sim = Simulation(verbose=False)
+    sim.launch((-200, 0))
+    for _ in range(600):
+        sim.step()
+    result = leaderboard.verify_submission("", record(sim).to_bytes())
+    assert not result['ok']
+    assert "before the level settled" in result['error']
+
+
+def test_bad_banana_type_index_is_a_bad_replay():
+    replay = Replay("", leaderboard.DEFAULT_LEVEL_HASH)
+    replay.end_frame = 600
+    replay.launches = [(100, 900.0, 400.0, "normal")]
+    data = bytearray(replay.to_bytes())
+    # The launch's type index is the last byte before the quality change count
+    data[-3] = 7
+    response = ask({"op": "submit", "player": "ann", "replay": base64.b64encode(bytes(data)).decode()})
+    assert not response['ok']
+    assert response['error'].startswith("bad replay")
+
+
+@pytest.mark.parametrize("request_", [
+    {"op": "submit", "player": "ann", "replay": 5},
+    {"op": "status", "id": [1]},
+    {"op": "status", "id": "1"},
+    {"op": "status", "id": 10 ** 30},
+])
+def test_malformed_requests_get_an_error_response(request_):
+    response = ask(request_)
+    assert response['ok'] is False
+    assert response['error']
@@ -0,0 +1,31 @@
+# tests/test_level_cache.py
+import os
+import shutil
+import threading
+
+from src import level_cache
+
+
+def test_concurrent_compiles_of_one_level(tmp_path):
+    path = str(tmp_path / "level.tmx")
+    shutil.copy("assets/levels/level1.tmx", path)
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def compile_it():
+        barrier.wait()
+        try:
+            for _ in range(10):
+                level_cache.compile_level(path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=compile_it) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(os.path.dirname(level_cache.cache_path(path))) == [os.path.basename(level_cache.cache_path(path))]
+    assert level_cache.load_level(path).hash == level_cache.file_hash(path).hex()
@@ -0,0 +1,20 @@
+# tests/test_progress.py
+import os
+
+import pytest
+
+pytest.importorskip("arcade")
+
+from src.progress import ProgressTracker
+
+
+@pytest.mark.parametrize("contents", ["[]", '"progress"', "3", '{"unlocked_levels": 5}', '{"version": "1"}'])
+def test_wrongly_shaped_file_is_treated_as_corrupt(tmp_path, contents):
+    path = str(tmp_path / "progress.json")
+    with open(path, 'w') as f:
+        f.write(contents)
+    tracker = ProgressTracker(path)
+    assert tracker.is_level_unlocked(1)
+    assert not tracker.is_level_unlocked(2)
+    assert os.path.exists(path + ".corrupt")
+
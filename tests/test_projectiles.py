@@ -0,0 +1,34 @@
+# tests/test_projectiles.py
+import json
+
+import pytest
+
+from src import projectiles
+
+
+def load_file():
+    with open(projectiles.PROJECTILES_FILE) as f:
+        return json.load(f)
+
+
+def test_shipped_file_is_valid():
+    assert projectiles.validate(load_file()) == []
+
+
+@pytest.mark.parametrize("entry", [[], "banana", 3, None])
+def test_entry_that_is_not_an_object_is_reported_by_name(entry):
+    data = load_file()
+    data["projectiles"]["broken"] = entry
+    assert projectiles.validate(data) == ["broken: must be an object"]
+
+
+def test_split_into_an_entry_that_is_not_an_object():
+    data = load_file()
+    data["projectiles"]["splitting"]["split"]["into"] = "broken"
+    data["projectiles"]["broken"] = []
+    assert projectiles.validate(data) == ["broken: must be an object"]
+
+
+@pytest.mark.parametrize("data", [[], "projectiles", None])
+def test_file_that_is_not_an_object(data):
+    assert projectiles.validate(data) == ["the file must hold a JSON object"]
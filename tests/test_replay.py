@@ -0,0 +1,86 @@
+# tests/test_replay.py
+import pytest
+
+pytest.importorskip("arcade")
+pytest.importorskip("pymunk")
+
+from src import replay
+from src.simulation import Simulation
+
+LEVEL = "assets/levels/level1.tmx"
+VOLLEY = [(900, 400), (1100, 600), (800, 250)]
+STEPS_PER_SHOT = 120
+
+
+def play_volley(sim):
+    while not sim.can_launch():
+        sim.step()
+    for force in VOLLEY:
+        sim.launch(force)
+        for _ in range(STEPS_PER_SHOT):
+            sim.step()
+
+
+def body_states(sim):
+    states = []
+    for sprite_list in (sim.enemy_list, sim.bamboo_list, sim.wood_list, sim.banana_list):
+        for sprite in sprite_list:
+            body = sim.physics_engine.get_physics_object(sprite).body
+            states.append((tuple(body.position), body.angle))
+    return states
+
+
+def test_replay_after_reset_matches_live_session(tmp_path):
+    sim = Simulation(LEVEL, verbose=False)
+    sim.prefill()  # As the game's loader does
+    play_volley(sim)
+
+    sim.reset()
+    play_volley(sim)
+
+    path = str(tmp_path / "after-reset.rpl")
+    replay.record(sim).save(path)
+    result = replay.verify(path)
+    assert result['ok'], result
+
+    replayed = replay.play(replay.Replay.load(path))
+    assert replayed.frame == sim.frame
+    assert body_states(replayed) == body_states(sim)
+
+
+def test_reset_matches_fresh_simulation():
+    fresh = Simulation(LEVEL, verbose=False)
+    play_volley(fresh)
+
+    sim = Simulation(LEVEL, verbose=False)
+    play_volley(sim)
+    sim.reset()
+    play_volley(sim)
+
+    assert sim.score() == fresh.score()
+    assert body_states(sim) == body_states(fresh)
+
+
+def test_reset_reuses_the_level_bodies():
+    sim = Simulation(LEVEL, verbose=False)
+    bodies = [sim.physics_engine.get_physics_object(sprite).body for sprite in sim.level_sprites()]
+    play_volley(sim)
+    sim.reset()
+    for sprite, body in zip(sim.level_sprites(), bodies, strict=True):
+        assert sim.physics_engine.get_physics_object(sprite).body is body
+
+
+def test_reset_stack_matches_fresh_simulation(tmp_path):
+    # Bananas that landed on the stack go back to their pool still carrying contact state
+    from benchmarks import levels
+    path = levels.generate("tower", 16, str(tmp_path))
+    fresh = Simulation(path, verbose=False)
+    play_volley(fresh)
+
+    sim = Simulation(path, verbose=False)
+    sim.prefill()
+    play_volley(sim)
+    sim.reset()
+    play_volley(sim)
+
+    assert body_states(sim) == body_states(fresh)
@@ -0,0 +1,54 @@
+# tests/test_simulation.py
+import pytest
+
+pytest.importorskip("arcade")
+pytest.importorskip("pymunk")
+
+from src import constants as c
+from src.projectiles import projectiles
+from src.simulation import REMOVED_BROKEN, Simulation
+
+
+def test_culled_blocks_make_no_debris_or_sound():
+    sim = Simulation(verbose=False)
+    block = sim.bamboo_list[0]
+    body = sim.physics_engine.get_physics_object(block).body
+    body.position = (0, c.WORLD_BOTTOM - 100)
+
+    sim.cull_bodies(0.0)
+    sim.check_collisions()
+
+    assert block not in sim.bamboo_list
+    assert len(sim.debris_list) == 0
+    assert sim.events == []
+
+
+def test_broken_blocks_make_debris_and_sound():
+    sim = Simulation(verbose=False)
+    block = sim.bamboo_list[0]
+
+    sim.queue_removal(block, REMOVED_BROKEN)
+    sim.check_collisions()
+
+    assert len(sim.debris_list) == c.DEBRIS_PIECES
+    assert [event[0] for event in sim.events] == ["bamboo"]
+
+
+def banana_speed_after_breaking_bamboo():
+    sim = Simulation(verbose=False)
+    while sim.settling:
+        sim.step()
+    bamboo = sim.bamboo_list[0]
+    banana = sim.spawn_banana(projectiles.get("normal"), (bamboo.center_x - 150, bamboo.center_y), (1500, 0))
+    body = sim.physics_engine.get_physics_object(banana).body
+    for _ in range(60):
+        sim.step()
+        if bamboo not in sim.bamboo_list:
+            return body.velocity.length
+    raise AssertionError("the banana did not break the bamboo")
+
+
+def test_breaking_bamboo_slows_the_banana(monkeypatch):
+    slowed = banana_speed_after_breaking_bamboo()
+    monkeypatch.setattr(c, "BAMBOO_BREAK_SLOWDOWN", 1.0)
+    assert slowed == pytest.approx(banana_speed_after_breaking_bamboo() * 0.5)
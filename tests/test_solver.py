@@ -0,0 +1,18 @@
+# tests/test_solver.py
+import pytest
+
+pytest.importorskip("arcade")
+pytest.importorskip("pymunk")
+
+from src.solver import simulate_shots
+
+LEVEL = "assets/levels/level1.tmx"
+
+
+@pytest.mark.parametrize("shot", [(5, 50), (45, 225), (180, 100)])
+def test_shots_that_miss_do_not_clear(shot):
+    assert simulate_shots(LEVEL, [shot]) == 1
+
+
+def test_shot_into_the_tower_clears():
+    assert simulate_shots(LEVEL, [(5, 400)]) == 0